@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Concurrent register + login traffic (both write the user and session
+tables) from forked worker processes against one SQLite file, with the
+old database settings (rollback journal, 5 s lock timeout, deferred
+transactions, a connection per request) and with the current ones (WAL,
+busy timeout, BEGIN IMMEDIATE, persistent connections).
+
+    python benchmarks/bench_db_contention.py [--workers 3] [--threads 4] [--users 50]
+
+Passwords are hashed with MD5 here so the database, not PBKDF2, is what
+the workers contend on; --real-hasher keeps the project's hashers.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import percentile  # noqa: E402
+
+LEGACY = {"OPTIONS": {}, "CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False}
+
+
+def client_loop(prefix, users, latencies, errors):
+    from django.test import Client
+
+    c = Client(HTTP_HOST="localhost", raise_request_exception=False)
+    for i in range(users):
+        creds = {"userName": f"{prefix}-{i}", "password": "pw-not-checked-here"}
+        for url in ("/djangoapp/register/", "/djangoapp/login/"):
+            t0 = time.perf_counter()
+            r = c.post(url, json.dumps(creds), content_type="application/json")
+            latencies.append(time.perf_counter() - t0)
+            if r.status_code >= 500:
+                errors.append(url)
+        c.get("/djangoapp/logout/")
+
+
+def worker(mode, wid, threads, users, out):
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+
+    if mode == "legacy":
+        connection_created.disconnect(dispatch_uid="sqlite_pragmas")
+        connection.settings_dict.update(LEGACY, OPTIONS={})
+    latencies, errors = [], []
+    pool = [
+        threading.Thread(target=client_loop,
+                         args=(f"{mode}-{wid}-{t}", users, latencies, errors))
+        for t in range(threads)
+    ]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    out.put((latencies, len(errors)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--users", type=int, default=50, help="per thread")
+    parser.add_argument("--real-hasher", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = "bench_settings"
+    os.environ.setdefault("sentiment_analyzer_url", "http://127.0.0.1:9")
+    os.environ.setdefault("DJANGOAPP_LOG_LEVEL", "WARNING")
+    import django
+    from django.conf import settings
+    if not args.real_hasher:
+        settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    django.setup()
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command("migrate", verbosity=0)
+    ctx = multiprocessing.get_context("fork")
+    requests = args.workers * args.threads * args.users * 2
+    print(f"{requests} register/login requests per mode "
+          f"({args.workers} workers x {args.threads} threads)")
+    print(f"{'settings':<10}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}")
+    for mode in ("legacy", "current"):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode=%s" % ("DELETE" if mode == "legacy" else "WAL"))
+        connection.close()  # children open their own
+
+        out = ctx.Queue()
+        procs = [
+            ctx.Process(target=worker, args=(mode, w, args.threads, args.users, out))
+            for w in range(args.workers)
+        ]
+        t0 = time.perf_counter()
+        for p in procs:
+            p.start()
+        results = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - t0
+
+        latencies = sorted(ms * 1000 for lat, _ in results for ms in lat)
+        errors = sum(n for _, n in results)
+        print(f"{mode:<10}{len(latencies) / elapsed:>8.0f}{percentile(latencies, 50):>9.1f}"
+              f"{percentile(latencies, 99):>9.1f}{latencies[-1]:>9.1f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
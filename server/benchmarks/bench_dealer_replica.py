@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Dealer list/detail latency served by the backend (response cache off and
+warm) vs the local dealer replica, against a stand-in backend with a
+fixed latency and `--dealers` dealers. Runs on a throwaway SQLite DB.
+
+    python benchmarks/bench_dealer_replica.py [--dealers 10000] [--latency-ms 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import BackendHandler, percentile, serve  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dealers", type=int, default=10_000)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    lat = args.latency_ms / 1000.0
+    backend, backend_url = serve(BackendHandler, latency=(lat, lat), dealers=args.dealers)
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ.setdefault("sentiment_analyzer_url", backend_url)
+    os.environ["DJANGO_SETTINGS_MODULE"] = "bench_settings"
+    os.environ.setdefault("DJANGOAPP_LOG_LEVEL", "WARNING")
+
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.core.management import call_command
+    from django.test import RequestFactory
+    from djangoapp import dealer_replica, views
+
+    call_command("migrate", verbosity=0)
+    t0 = time.perf_counter()
+    counts = dealer_replica.sync()
+    print(f"sync: {counts['synced']} dealers in {time.perf_counter() - t0:.2f} s")
+
+    rf = RequestFactory()
+    cases = {
+        "all dealers": lambda: views.get_dealerships(rf.get("/")),
+        "one state": lambda: views.get_dealerships(rf.get("/"), "Texas"),
+        "paged": lambda: views.get_dealerships(rf.get("/?limit=20&cursor=5000")),
+        "by zip": lambda: views.get_dealerships(rf.get("/?zip=88563&limit=20")),
+        "details": lambda: views.get_dealer_details(rf.get("/"), 4242),
+    }
+    modes = (
+        ("backend", False, 0),
+        ("backend+cache", False, 300),
+        ("replica", True, 300),
+    )
+    print(f"{'request':<13}" + "".join(f"{m + ' p50 us':>20}" for m, _, _ in modes))
+    for name, call in cases.items():
+        row = f"{name:<13}"
+        for _, replica, ttl in modes:
+            settings.DEALER_REPLICA, settings.DEALER_CACHE_TTL = replica, ttl
+            caches["dealers"].clear()
+            dealer_replica.reset()
+            n = 10 if ttl == 0 else args.requests  # uncached: every call is a fetch
+            call()
+            samples = []
+            for _ in range(n):
+                t = time.perf_counter()
+                assert call().status_code == 200
+                samples.append((time.perf_counter() - t) * 1e6)
+            row += f"{percentile(samples, 50):>20.0f}"
+        print(row)
+
+    # The backend goes away: the replica keeps answering (stale-if-error).
+    backend.shutdown()
+    backend.server_close()
+    settings.DEALER_REPLICA_MAX_AGE = 0
+    caches["dealers"].clear()
+    resp = views.get_dealer_details(rf.get("/"), 7)
+    print(f"backend down, stale replica: details status {resp.status_code}, "
+          f"{len(resp.content)} bytes")
+
+
+if __name__ == "__main__":
+    main()
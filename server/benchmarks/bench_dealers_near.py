@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Nearest-dealer search over `--dealers` synthetic dealers (half spread
+over the continental US, half clustered around 50 metro areas): KD-tree
+build time and query latency against a brute-force haversine scan
+(results checked equal), then the /dealers/near/ view end to end, served
+from a dealer replica synced from the stand-in backend.
+
+    python benchmarks/bench_dealers_near.py [--dealers 100000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import BackendHandler, percentile, serve  # noqa: E402
+
+
+def synthetic_dealers(n, rnd):
+    metros = [(rnd.uniform(26, 48), rnd.uniform(-122, -70)) for _ in range(50)]
+    dealers = []
+    for i in range(1, n + 1):
+        if i % 2:
+            lat, lon = rnd.uniform(25, 49), rnd.uniform(-124, -67)
+        else:
+            mlat, mlon = rnd.choice(metros)
+            lat, lon = rnd.gauss(mlat, 0.3), rnd.gauss(mlon, 0.3)
+        # Strings, as the Mongo schema stores them.
+        dealers.append({"id": i, "lat": f"{lat:.5f}", "long": f"{lon:.5f}"})
+    return dealers
+
+
+def brute_force(geo, dealers, lat, lon, k, radius):
+    found = []
+    for d in dealers:
+        km = geo.haversine_km(lat, lon, *geo.dealer_coords(d))
+        if radius is None or km <= radius:
+            found.append((km, d["id"]))
+    return [i for _, i in sorted(found)[:k]]
+
+
+def timed(fn, queries):
+    samples = []
+    for q in queries:
+        t = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - t) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dealers", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = "bench_settings"
+    os.environ.setdefault("DJANGOAPP_LOG_LEVEL", "WARNING")
+    backend, backend_url = serve(BackendHandler, dealers=args.dealers)
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ.setdefault("sentiment_analyzer_url", backend_url)
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.test import RequestFactory
+    from djangoapp import dealer_replica, geo, views
+
+    rnd = random.Random(args.seed)
+    dealers = synthetic_dealers(args.dealers, rnd)
+    t0 = time.perf_counter()
+    tree = geo.KDTree(dealers)
+    print(f"{len(tree)} dealers, KD-tree built in {time.perf_counter() - t0:.2f} s")
+
+    queries = [(rnd.uniform(25, 49), rnd.uniform(-124, -67)) for _ in range(args.queries)]
+    print(f"{'query':<22}{'p50 us':>9}{'p99 us':>9}{'brute p50 us':>14}")
+    for k, radius in ((1, None), (10, None), (100, None), (10, 50.0)):
+        samples = timed(lambda q: tree.nearest(q[0], q[1], k, radius), queries)
+        checked = queries[:20]
+        brute = timed(lambda q: brute_force(geo, dealers, q[0], q[1], k, radius), checked)
+        for lat, lon in checked:
+            got = [d["id"] for _, d in tree.nearest(lat, lon, k, radius)]
+            assert got == brute_force(geo, dealers, lat, lon, k, radius), (lat, lon, k, radius)
+        name = f"k={k}" + (f", radius={radius:g} km" if radius else "")
+        print(f"{name:<22}{percentile(samples, 50):>9.0f}{percentile(samples, 99):>9.0f}"
+              f"{percentile(brute, 50):>14.0f}")
+
+    # End to end: replica synced from the stand-in, tree built on first use.
+    call_command("migrate", verbosity=0)
+    dealer_replica.sync()
+    dealer_replica.reset()
+    rf = RequestFactory()
+    t0 = time.perf_counter()
+    views.dealers_near(rf.get("/?lat=40&lon=-100"))
+    print(f"view, first request (loads replica, builds tree): {time.perf_counter() - t0:.2f} s")
+    samples = timed(
+        lambda q: views.dealers_near(rf.get(f"/?lat={q[0]:.4f}&lon={q[1]:.4f}&k=10")),
+        queries,
+    )
+    print(f"view, k=10: p50 {percentile(samples, 50):.0f} us, p99 {percentile(samples, 99):.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Upstream GET throughput with a fresh connection per call (the old bare
+requests.get) vs the pooled keep-alive session in restapis, using the
+same number of concurrent threads as a busy gunicorn worker would.
+
+    python benchmarks/bench_http_pool.py [--threads 8] [--calls 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import BackendHandler, serve  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    server, backend_url = serve(BackendHandler)
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ.setdefault("sentiment_analyzer_url", backend_url)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+
+    import django
+    django.setup()
+    import requests
+    from djangoapp import restapis
+
+    url = f"{backend_url}/fetchReviews/dealer/5"
+
+    def bare(_):
+        r = requests.get(url, timeout=10)
+        r.raise_for_status()
+        return r.json()
+
+    def pooled(_):
+        r = restapis._session("backend").get(url, timeout=restapis._timeout())
+        r.raise_for_status()
+        return r.json()
+
+    print(f"{'mode':<10}{'req/s':>10}{'connections':>14}")
+    for name, fn in (("bare", bare), ("pooled", pooled)):
+        server.connections = 0
+        with ThreadPoolExecutor(args.threads) as pool:
+            t0 = time.perf_counter()
+            list(pool.map(fn, range(args.calls)))
+            elapsed = time.perf_counter() - t0
+        print(f"{name:<10}{args.calls / elapsed:>10.0f}{server.connections:>14}")
+
+
+if __name__ == "__main__":
+    main()
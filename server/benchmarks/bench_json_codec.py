@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+JSON encode/decode cost of djangoapp.codec (orjson) vs the stdlib path
+on realistic payloads, and the "json" share of a get_dealer_reviews
+request's Server-Timing with each, against local stand-ins.
+
+    python benchmarks/bench_json_codec.py [--reviews 200] [--dealers 10000]
+
+Needs orjson installed for the fast column; without it both columns use
+the stdlib.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import BackendHandler, SentimentHandler, make_dealer, make_review, serve  # noqa: E402
+
+
+def per_call_us(fn, arg, budget=0.3):
+    n, t0 = 0, time.perf_counter()
+    while time.perf_counter() - t0 < budget:
+        fn(arg)
+        n += 1
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", type=int, default=200)
+    parser.add_argument("--dealers", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    _, backend_url = serve(BackendHandler)
+    _, sent_url = serve(SentimentHandler)
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ["sentiment_analyzer_url"] = sent_url
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+    os.environ.setdefault("DJANGOAPP_LOG_LEVEL", "WARNING")
+
+    import django
+    django.setup()
+    from django.core.serializers.json import DjangoJSONEncoder
+    from django.test import Client
+    from djangoapp import codec
+
+    fast = (codec.dumps, codec.loads)
+
+    def std_dumps(obj, sort_keys=False):
+        return json.dumps(obj, cls=DjangoJSONEncoder, sort_keys=sort_keys).encode("utf-8")
+
+    std = (std_dumps, json.loads)
+
+    reviews = [dict(make_review(i, 7), sentiment="positive") for i in range(args.reviews)]
+    payloads = {
+        f"reviews page ({args.reviews})": {"status": 200, "reviews": reviews},
+        f"dealer list ({args.dealers})": {
+            "status": 200, "dealers": [make_dealer(i) for i in range(args.dealers)]
+        },
+        "review POST body": {k: v for k, v in make_review(1, 7).items() if k != "id"},
+    }
+    print(f"codec: {codec.NAME}")
+    print(f"{'payload':<24}{'KB':>7}{'encode us':>11}{'fast':>9}{'decode us':>11}{'fast':>9}")
+    for name, obj in payloads.items():
+        body = std_dumps(obj)
+        print(f"{name:<24}{len(body) / 1024:>7.0f}"
+              f"{per_call_us(std[0], obj):>11.0f}{per_call_us(fast[0], obj):>9.0f}"
+              f"{per_call_us(std[1], body):>11.0f}{per_call_us(fast[1], body):>9.0f}")
+
+    # Whole requests: the warm reviews view is mostly upstream decode and
+    # response encode, which Server-Timing reports as "json" (encode only).
+    c = Client(HTTP_HOST="localhost", HTTP_X_PROFILE="1")
+    url = f"/djangoapp/reviews/dealer/{args.reviews}/"
+    timing = re.compile(r"(\w+);dur=([\d.]+)")
+    print(f"\nGET {url} x{args.requests} (review cache off)")
+    print(f"{'codec':<8}{'total ms':>10}{'json ms':>9}{'json share':>12}")
+    from django.conf import settings
+    settings.REVIEW_CACHE_TTL = 0
+    for name, (dumps, loads) in (("stdlib", std), (codec.NAME, fast)):
+        codec.dumps, codec.loads = dumps, loads
+        c.get(url)
+        total = spent = 0.0
+        for _ in range(args.requests):
+            parts = dict(timing.findall(c.get(url)["Server-Timing"]))
+            total += float(parts["total"])
+            spent += float(parts.get("json", 0))
+        n = args.requests
+        print(f"{name:<8}{total / n:>10.2f}{spent / n:>9.2f}{spent / total:>11.0%}")
+    codec.dumps, codec.loads = fast
+
+
+if __name__ == "__main__":
+    main()
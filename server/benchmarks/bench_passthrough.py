@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+CPU time and peak Python heap per uncached get_dealerships request for a
+large dealer list, decoding and re-encoding the backend's JSON vs passing
+its bytes through (DEALER_PASSTHROUGH), against a local stand-in.
+
+    python benchmarks/bench_passthrough.py [--dealers 10000] [--requests 30]
+
+CPU is the request thread's own (the stand-in runs in other threads);
+heap is tracemalloc's peak during one request, on top of what was live.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import BackendHandler, make_dealer, serve  # noqa: E402
+
+
+class CachedBodyHandler(BackendHandler):
+    """Serves /fetchDealers from a pre-rendered body, so the stand-in's own
+    json.dumps does not skew the numbers."""
+
+    def do_GET(self):
+        if self.path != "/fetchDealers":
+            return super().do_GET()
+        self.server.requests += 1
+        body = self.server.body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dealers", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=30)
+    args = parser.parse_args()
+
+    body = json.dumps([make_dealer(i) for i in range(1, args.dealers + 1)]).encode()
+    _, backend_url = serve(CachedBodyHandler, body=body)
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ.setdefault("sentiment_analyzer_url", backend_url)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+    os.environ.setdefault("DJANGOAPP_LOG_LEVEL", "WARNING")
+    os.environ["DEALER_CACHE_TTL"] = "0"  # every request goes upstream
+
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.test import RequestFactory
+    from djangoapp import views
+
+    rf = RequestFactory()
+
+    def once():
+        resp = views.get_dealerships(rf.get("/"))
+        assert resp.status_code == 200
+        return resp.content
+
+    print(f"{args.dealers} dealers, backend body {len(body) / 1e6:.2f} MB")
+    print(f"{'mode':<14}{'cpu ms/req':>11}{'wall ms/req':>12}{'peak heap MB':>13}")
+    outputs = {}
+    for name, passthrough in (("decode+encode", False), ("passthrough", True)):
+        settings.DEALER_PASSTHROUGH = passthrough
+        once()  # warm the connection pool
+        c0, w0 = time.thread_time(), time.perf_counter()
+        for _ in range(args.requests):
+            once()
+        cpu = (time.thread_time() - c0) / args.requests * 1000
+        wall = (time.perf_counter() - w0) / args.requests * 1000
+
+        tracemalloc.start()
+        outputs[name] = once()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<14}{cpu:>11.2f}{wall:>12.2f}{peak / 1e6:>13.2f}")
+
+    a, b = (json.loads(o) for o in outputs.values())
+    assert a == b, "passthrough changed the payload"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Peak memory and throughput of the review export (djangoapp/export.py)
+as the number of reviews grows, against local stand-ins. Peak Python
+heap should stay flat; it depends on EXPORT_PAGE_SIZE, not on the total.
+
+    python benchmarks/bench_review_export.py [--sizes 10000,50000,200000]
+
+The sentiment cache is a DummyCache here. In production it is an LRU
+bounded by SENTIMENT_CACHE_MAX_ENTRIES whatever the export does.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import BackendHandler, SentimentHandler, serve  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,50000,200000")
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    backend, backend_url = serve(BackendHandler)
+    _, sent_url = serve(SentimentHandler)
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ["sentiment_analyzer_url"] = sent_url
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+    os.environ.setdefault("DJANGOAPP_LOG_LEVEL", "WARNING")
+    os.environ["SENTIMENT_CACHE_BACKEND"] = "django.core.cache.backends.dummy.DummyCache"
+
+    import django
+    django.setup()
+    from djangoapp import export
+
+    print(f"page size {args.page_size}")
+    print(f"{'reviews':>9}{'fmt':>8}{'MB out':>9}{'seconds':>9}{'reviews/s':>11}{'peak heap MB':>14}")
+    for size in (int(n) for n in args.sizes.split(",")):
+        backend.reviews = size
+        for fmt in ("ndjson", "csv"):
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            out = 0
+            for chunk in export.stream(fmt, args.page_size):
+                out += len(chunk)
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{size:>9}{fmt:>8}{out / 1e6:>9.1f}{elapsed:>9.2f}"
+                  f"{size / elapsed:>11.0f}{peak / 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Seeding the car catalog: the old per-row get_or_create vs the streaming
+bulk loader (populate.load_cars + iter_json_array), on a throwaway SQLite
+database, with a synthetic car_records.json-shaped file.
+
+    python benchmarks/bench_seed_catalog.py [--rows 100000] [--legacy-rows 5000]
+
+The legacy path is timed on fewer rows (it is linear) and reported as rows/s.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MAKES = ["Nissan", "Kia", "Audi", "Mercedes", "Toyota", "Ford", "Honda", "BMW"]
+BODIES = ["SUV", "Sedan", "Hatchback", "Coupe", "Convertible", "Minivan", "Pickup"]
+
+
+def write_catalog(path, rows):
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write('{"cars": [\n')
+        for i in range(rows):
+            if i:
+                fp.write(",\n")
+            json.dump({
+                "make": random.choice(MAKES),
+                "model": f"Model-{i % 5000}",
+                "bodyType": random.choice(BODIES),
+                "year": random.randint(2015, 2023),
+                "dealer_id": random.randint(1, 50),
+                "mileage": random.randint(0, 100000),
+            }, fp)
+        fp.write("\n]}\n")
+
+
+def legacy_load(rows):
+    from djangoapp.models import CarMake, CarModel
+    for row in rows:
+        make, _ = CarMake.objects.get_or_create(
+            name=row["make"], defaults={"description": ""}
+        )
+        CarModel.objects.get_or_create(
+            name=row["model"], car_make=make, dealer_id=row["dealer_id"],
+            defaults={"type": row["bodyType"].upper()[:12], "year": row["year"]},
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--legacy-rows", type=int, default=5_000)
+    args = parser.parse_args()
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = "bench_settings"
+    os.environ.setdefault("sentiment_analyzer_url", "http://127.0.0.1:9")
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from djangoapp.models import CarMake, CarModel
+    from djangoapp.populate import iter_json_array, load_cars
+
+    call_command("migrate", verbosity=0)
+    path = os.path.join(tempfile.mkdtemp(prefix="catalog-"), "cars.json")
+    write_catalog(path, args.rows)
+    print(f"catalog: {args.rows} rows, {os.path.getsize(path) / 1e6:.1f} MB")
+
+    with open(path, encoding="utf-8") as fp:
+        legacy_rows = [row for _, row in zip(range(args.legacy_rows), iter_json_array(fp, "cars"))]
+    t0 = time.perf_counter()
+    legacy_load(legacy_rows)
+    legacy = time.perf_counter() - t0
+    CarModel.objects.all().delete()
+    CarMake.objects.all().delete()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    with open(path, encoding="utf-8") as fp:
+        created = load_cars(iter_json_array(fp, "cars"))
+    bulk = time.perf_counter() - t0
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+    print(f"{'loader':<14}{'rows':>9}{'seconds':>10}{'rows/s':>10}")
+    print(f"{'get_or_create':<14}{len(legacy_rows):>9}{legacy:>10.2f}"
+          f"{len(legacy_rows) / legacy:>10.0f}")
+    print(f"{'bulk stream':<14}{created:>9}{bulk:>10.2f}{created / bulk:>10.0f}"
+          f"   (peak RSS growth {rss_growth / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Sentiment throughput (texts/sec and texts/sec per core): the Flask
+analyzer scoring one text per GET, as restapis calls it today, vs the
+in-process engine (djangoapp.sentiment) in one pass and over a process
+pool. The Flask app runs for real in a local thread.
+
+    python benchmarks/bench_sentiment_engine.py [--texts 5000] [--processes 4]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+MICROSERVICE = os.path.join(ROOT, "djangoapp", "microservices")
+
+
+def corpus(n, seed=0):
+    """Review-like texts built from the seed reviews plus lexicon words."""
+    with open(os.path.join(ROOT, "database", "data", "reviews.json")) as fp:
+        seeds = [r["review"] for r in json.load(fp)["reviews"]]
+    extra = ("great", "terrible", "friendly", "slow", "not", "very", "service",
+             "price", "car", "dealer", "would", "recommend", "never", "again!")
+    rnd = random.Random(seed)
+    return [
+        " ".join([rnd.choice(seeds)] + rnd.sample(extra, rnd.randint(2, 8)))
+        for _ in range(n)
+    ]
+
+
+def serve_flask():
+    # The microservice loads VADER through nltk_data; point it at the zip
+    # it ships with.
+    data = tempfile.mkdtemp(prefix="nltk-data-")
+    os.makedirs(os.path.join(data, "sentiment"))
+    shutil.copy(
+        os.path.join(MICROSERVICE, "sentiment", "vader_lexicon.zip"),
+        os.path.join(data, "sentiment"),
+    )
+    os.environ["NLTK_DATA"] = data
+    sys.path.insert(0, MICROSERVICE)
+    import contextlib
+    import io
+    import logging
+
+    from werkzeug.serving import make_server
+
+    from app import app
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    quiet = contextlib.redirect_stdout(io.StringIO())  # the app prints per call
+    return f"http://127.0.0.1:{server.server_port}", quiet
+
+
+def rate(name, n, seconds, cores):
+    per_sec = n / seconds
+    print(f"{name:<24}{n:>8}{seconds:>10.2f}{per_sec:>12.0f}{per_sec / cores:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=5000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    import requests
+
+    from djangoapp import sentiment
+
+    texts = corpus(args.texts)
+    url, quiet = serve_flask()
+    print(f"{'path':<24}{'texts':>8}{'seconds':>10}{'texts/s':>12}{'per core':>12}")
+
+    session = requests.Session()
+    # quote(safe=""), as restapis: Flask does not turn "+" back into spaces
+    # in a path.
+    t0 = time.perf_counter()
+    with quiet:
+        flask = [session.get(f"{url}/analyze/{quote(t, safe='')}").json()["sentiment"]
+                 for t in texts]
+    rate("flask GET per text", len(texts), time.perf_counter() - t0, 1)
+
+    t0 = time.perf_counter()
+    sentiment.engine()
+    print(f"(lexicon load {1000 * (time.perf_counter() - t0):.0f} ms, "
+          f"{len(sentiment.engine().lexicon)} words)")
+
+    t0 = time.perf_counter()
+    local = sentiment.label_many(texts)
+    rate("engine, 1 process", len(texts), time.perf_counter() - t0, 1)
+    assert local == flask, "engine labels differ from the microservice"
+
+    if args.processes > 1:
+        sentiment.label_many(texts[:2 * sentiment.MIN_CHUNK], args.processes)  # warm the pool
+        t0 = time.perf_counter()
+        pooled = sentiment.label_many(texts, processes=args.processes)
+        rate(f"engine, {args.processes} processes", len(texts),
+             time.perf_counter() - t0, args.processes)
+        assert pooled == flask
+
+
+if __name__ == "__main__":
+    main()
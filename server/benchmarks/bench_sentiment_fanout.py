@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Latency of get_dealer_reviews for dealers with 1, 10 and 100 reviews,
+sequential sentiment calls vs the bounded fan-out vs one batch request,
+against local stand-ins.
+
+    python benchmarks/bench_sentiment_fanout.py [--runs 30]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import BackendHandler, SentimentHandler, percentile, serve  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--slow-ratio", type=float, default=0.01)
+    parser.add_argument("--slow-s", type=float, default=5.0)
+    args = parser.parse_args()
+
+    lat = args.latency_ms / 1000.0
+    _, backend_url = serve(BackendHandler, latency=(lat / 2, lat))
+    _, sent_url = serve(
+        SentimentHandler, latency=(lat / 2, lat),
+        slow_ratio=args.slow_ratio, slow=args.slow_s,
+    )
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ["sentiment_analyzer_url"] = sent_url
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+    # Every page must be scored: no cached enriched reviews to skip it.
+    os.environ["REVIEW_CACHE_TTL"] = "0"
+
+    import django
+    django.setup()
+    from django.core.cache import caches
+    from django.test import RequestFactory
+    from djangoapp import restapis, views
+
+    rf = RequestFactory()
+    modes = [
+        ("sequential", 1, False),
+        ("fan-out", restapis.SENTIMENT_WORKERS, False),
+        ("batch", restapis.SENTIMENT_WORKERS, True),
+    ]
+    print(f"{'mode':<12}{'reviews':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, workers, batch in modes:
+        restapis.SENTIMENT_WORKERS = workers
+        restapis._executor = None  # the pool is sized on first use
+        restapis.SENTIMENT_BATCH = batch
+        for n in (1, 10, 100):
+            samples = []
+            for _ in range(args.runs):
+                caches["sentiment"].clear()  # measure cold pages
+                t0 = time.perf_counter()
+                resp = views.get_dealer_reviews(rf.get("/"), n)
+                samples.append((time.perf_counter() - t0) * 1000)
+                assert resp.status_code == 200
+            print(f"{name:<12}{n:>8}{percentile(samples, 50):>10.1f}"
+                  f"{percentile(samples, 99):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+get_dealer_reviews latency while the sentiment analyzer is down (hanging
+or answering 503), with and without the circuit breaker, against local
+stand-ins. Every page is cold (sentiment cache cleared) so each one
+needs the analyzer. After the outage the analyzer comes back and the
+breaker's half-open probe closes it again.
+
+    python benchmarks/bench_sentiment_outage.py [--pages 10] [--reviews 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import BackendHandler, SentimentHandler, serve  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--reviews", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--hang-s", type=float, default=2.0)
+    args = parser.parse_args()
+
+    lat = args.latency_ms / 1000.0
+    _, backend_url = serve(BackendHandler, latency=(lat / 2, lat))
+    sent, sent_url = serve(SentimentHandler, latency=(lat / 2, lat), slow=args.hang_s)
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ["sentiment_analyzer_url"] = sent_url
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+    os.environ.setdefault("SENTIMENT_DEADLINE", str(args.hang_s / 2))
+    os.environ.setdefault("SENTIMENT_BREAKER_RESET", "1.0")
+
+    import django
+    django.setup()
+    from django.core.cache import caches
+    from django.test import RequestFactory
+    from djangoapp import restapis, views
+    from djangoapp.review_cache import invalidate_reviews
+
+    rf = RequestFactory()
+
+    def page_ms():
+        caches["sentiment"].clear()
+        invalidate_reviews(args.reviews)
+        t0 = time.perf_counter()
+        resp = views.get_dealer_reviews(rf.get("/"), args.reviews)
+        assert resp.status_code == 200
+        return (time.perf_counter() - t0) * 1000
+
+    print(f"backend only: {page_ms():.0f} ms warm-up, analyzer up")
+    for outage in ("hang", "503"):
+        for failures in (0, restapis.SENTIMENT_BREAKER_FAILURES):
+            breaker = restapis.CircuitBreaker(
+                "sentiment", failures, restapis.SENTIMENT_BREAKER_RESET
+            )
+            restapis._sentiment_breaker = breaker
+            restapis.SENTIMENT_BATCH = True
+            sent.outage = outage
+            samples = [page_ms() for _ in range(args.pages)]
+            label = f"breaker({failures})" if failures else "no breaker"
+            print(f"{outage:<5} {label:<12} pages ms: "
+                  + " ".join(f"{ms:.0f}" for ms in samples)
+                  + f"   {breaker.stats()}")
+
+            sent.outage = None
+            if failures:
+                time.sleep(restapis.SENTIMENT_BREAKER_RESET)
+                ms = page_ms()
+                print(f"      recovered    probe page {ms:.0f} ms, "
+                      f"state {breaker.stats()['state']}")
+
+
+if __name__ == "__main__":
+    main()
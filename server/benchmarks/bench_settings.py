@@ -0,0 +1,16 @@
+"""Project settings with a throwaway SQLite database for the benchmarks."""
+
+import os
+import tempfile
+
+from djangoproj import database
+from djangoproj.settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": database.config(
+        "sqlite:///" + os.environ.get(
+            "BENCH_DB", os.path.join(tempfile.mkdtemp(prefix="bench-db-"), "bench.sqlite3")
+        ),
+        BASE_DIR,  # noqa: F405
+    )
+}
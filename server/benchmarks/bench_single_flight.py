@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Upstream calls made by a burst of identical dealer page requests (reviews
+and details for one dealer, all caches cold), without coalescing, with
+in-process single-flight, and with single-flight shared across forked
+worker processes, against local stand-ins.
+
+    python benchmarks/bench_single_flight.py [--workers 4] [--threads 25]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import BackendHandler, SentimentHandler, serve  # noqa: E402
+
+DEALER_ID = 7
+
+
+def burst(threads, barrier):
+    """`threads` concurrent page loads released together."""
+    from django.test import RequestFactory
+    from djangoapp import views
+
+    rf = RequestFactory()
+    errors = []
+
+    def page():
+        barrier.wait()
+        for view in (views.get_dealer_reviews, views.get_dealer_details):
+            if view(rf.get("/"), DEALER_ID).status_code != 200:
+                errors.append(view.__name__)
+
+    pool = [threading.Thread(target=page) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return errors
+
+
+def worker(threads, barrier, single_flight, shared):
+    from djangoapp import restapis
+
+    restapis.SINGLE_FLIGHT = single_flight
+    restapis.SINGLE_FLIGHT_SHARED = shared
+    errors = burst(threads, barrier)
+    os._exit(1 if errors else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=25)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    lat = args.latency_ms / 1000.0
+    backend, backend_url = serve(BackendHandler, latency=(lat, lat))
+    sent, sent_url = serve(SentimentHandler, latency=(lat, lat))
+    os.environ["BACKEND_URL"] = backend_url
+    os.environ["sentiment_analyzer_url"] = sent_url
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+    # Every request must go upstream: no response, review or sentiment
+    # caching (locmem per process) to hide the duplicates.
+    os.environ["DEALER_CACHE_TTL"] = "0"
+    os.environ["REVIEW_CACHE_TTL"] = "0"
+    os.environ["SENTIMENT_CACHE_BACKEND"] = "django.core.cache.backends.dummy.DummyCache"
+
+    import django
+    django.setup()
+
+    ctx = multiprocessing.get_context("fork")
+    pages = args.workers * args.threads
+    print(f"{pages} concurrent page loads ({args.workers} workers x {args.threads} threads)")
+    print(f"{'mode':<28}{'backend calls':>14}{'sentiment calls':>16}{'seconds':>9}")
+    for name, single_flight, shared in (
+        ("no coalescing", False, False),
+        ("single-flight, per worker", True, False),
+        ("single-flight, shared", True, True),
+    ):
+        backend.requests = sent.requests = 0
+        barrier = ctx.Barrier(pages)
+        procs = [
+            ctx.Process(target=worker, args=(args.threads, barrier, single_flight, shared))
+            for _ in range(args.workers)
+        ]
+        t0 = time.perf_counter()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - t0
+        assert all(p.exitcode == 0 for p in procs), "some page loads failed"
+        print(f"{name:<28}{backend.requests:>14}{sent.requests:>16}{elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
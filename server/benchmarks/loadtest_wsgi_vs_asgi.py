@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Throughput of the dealer/review views under gunicorn (sync WSGI workers)
+vs uvicorn (ASGI, DJANGO_ASYNC_VIEWS=1) with the same worker count, at
+200 concurrent clients, against a stand-in backend with fixed latency.
+The dealer cache, the dealer replica and single-flight are off, so every
+request makes its own upstream call; "in flight" is the most upstream
+calls the backend saw at once. The backend is the asyncio stand-in
+(standins.AsyncBackend), which a few hundred clients do not saturate.
+
+    python benchmarks/loadtest_wsgi_vs_asgi.py [--clients 200] [--duration 15]
+        [--latency-ms 50]
+
+On a small machine Django's own CPU cost per request caps both servers
+at a fast backend; --latency-ms 500 or 1000 shows how many upstream
+calls each holds open.
+
+Needs gunicorn, uvicorn and httpx (requirements.txt).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import percentile  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_backend(latency_ms: float):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(SERVER_DIR, "benchmarks", "standins.py"),
+         "backend", "--async", "--latency-ms", str(latency_ms)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    return proc, proc.stdout.readline().strip()
+
+
+def start_django(kind: str, workers: int, backend_url: str, clients: int, latency_ms: float):
+    port = free_port()
+    # Upstream-bound: no dealer cache or replica, no coalescing. A pool of
+    # `clients` keep-alive connections, so an ASGI worker holding every
+    # client's call does not reconnect for most of them.
+    env = dict(os.environ, BACKEND_URL=backend_url,
+               sentiment_analyzer_url=backend_url, SENTIMENT_BATCH="0",
+               DEALER_CACHE_TTL="0", DEALER_REPLICA="0", SINGLE_FLIGHT="0",
+               BACKEND_POOL_SIZE=str(clients), DJANGOAPP_LOG_LEVEL="WARNING")
+    if kind == "wsgi":
+        env["DJANGO_ASYNC_VIEWS"] = "0"
+        cmd = ["gunicorn", "--bind", f"127.0.0.1:{port}",
+               "--workers", str(workers), "djangoproj.wsgi"]
+    else:
+        env["DJANGO_ASYNC_VIEWS"] = "1"
+        cmd = ["uvicorn", "djangoproj.asgi:application", "--host", "127.0.0.1",
+               "--port", str(port), "--workers", str(workers),
+               "--no-access-log", "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=SERVER_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(f"{base}/djangoapp/dealer/1/", timeout=5 + latency_ms / 1000)
+            return proc, base
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+async def _get(conn, path: str):
+    """One GET on a keep-alive connection; returns (status, server keeps it open)."""
+    reader, writer = conn
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length, chunked, keep = 0, False, True
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding":
+            chunked = "chunked" in value
+        elif name == "connection":
+            keep = value != "close"
+    if chunked:
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    else:
+        await reader.readexactly(length)
+    return status, keep
+
+
+async def run_clients(base: str, clients: int, duration: float):
+    # A bare asyncio HTTP/1.1 client, one connection per client: httpx's
+    # async pool spends more CPU than the servers under test at 200
+    # connections, which on a small machine starves them.
+    host, port = base.rsplit("/", 1)[1].split(":")
+    latencies, errors = [], 0
+    stop = time.perf_counter() + duration
+
+    async def client():
+        nonlocal errors
+        conn = None
+        while time.perf_counter() < stop:
+            dealer = random.randint(1, 50)
+            path = random.choice((f"/djangoapp/dealer/{dealer}/",
+                                  "/djangoapp/get_dealers/"))
+            t0 = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = await asyncio.open_connection(host, int(port))
+                status, keep = await asyncio.wait_for(_get(conn, path), 30)
+                if status >= 400:
+                    raise OSError(f"HTTP {status}")
+                latencies.append((time.perf_counter() - t0) * 1000)
+            except (OSError, ValueError, IndexError, asyncio.TimeoutError,
+                    asyncio.IncompleteReadError):
+                errors += 1
+                keep = False
+            if not keep and conn is not None:
+                conn[1].close()
+                conn = None
+        if conn is not None:
+            conn[1].close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - t0
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    backend, backend_url = start_backend(args.latency_ms)
+    try:
+        print(f"{'server':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+              f"{'errors':>8}{'in flight':>11}")
+        for kind in ("wsgi", "asgi"):
+            proc, base = start_django(kind, args.workers, backend_url,
+                                      args.clients, args.latency_ms)
+            try:
+                httpx.get(f"{backend_url}/__stats")  # reset after start-up
+                lat, errors, elapsed = asyncio.run(
+                    run_clients(base, args.clients, args.duration)
+                )
+                peak = httpx.get(f"{backend_url}/__stats").json()["peak_in_flight"]
+            finally:
+                proc.terminate()
+                proc.wait()
+            print(f"{kind:<8}{len(lat) / elapsed:>10.0f}"
+                  f"{percentile(lat, 50):>10.1f}{percentile(lat, 99):>10.1f}"
+                  f"{errors:>8}{peak:>11}")
+    finally:
+        backend.terminate()
+
+
+if __name__ == "__main__":
+    main()
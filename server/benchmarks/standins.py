@@ -0,0 +1,319 @@
+"""
+Local stand-ins for the upstream services used by the benchmarks.
+
+Each server runs on 127.0.0.1 in a daemon thread and mimics the parts of
+the Node backend (server/database/app.js) and the sentiment analyzer
+(djangoapp/microservices/app.py) that Django talks to, with a configurable
+artificial latency so the numbers resemble a real network hop.
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+def make_review(i: int, dealer_id: int) -> dict:
+    return {
+        "id": i,
+        "name": f"Reviewer {i}",
+        "dealership": dealer_id,
+        "review": f"Great service and a fantastic car, review number {i}",
+        "purchase": True,
+        "purchase_date": "07/11/2020",
+        "car_make": "Audi",
+        "car_model": "A6",
+        "car_year": 2020,
+    }
+
+
+def make_dealer(i: int) -> dict:
+    return {
+        "id": i,
+        "city": "El Paso",
+        "state": "Texas",
+        "st": "TX",
+        "address": f"{i} Nova Court",
+        "zip": str(88500 + i % 100),
+        # Spread over the continental US (an additive-recurrence lattice).
+        "lat": round(25.0 + 24.0 * (i * 0.6180339887 % 1.0), 4),
+        "long": round(-124.0 + 57.0 * (i * 0.7548776662 % 1.0), 4),
+        "short_name": f"Dealer{i}",
+        "full_name": f"Dealer {i} Car Dealership",
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # avoid delayed-ACK stalls on keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        self.server.requests += 1
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _sleep(self):
+        lo, hi = self.server.latency
+        if hi > 0:
+            time.sleep(random.uniform(lo, hi))
+
+
+class BackendHandler(_Handler):
+    """
+    GET /fetchReviews/dealer/<n> returns n reviews for dealer n, /fetchReviews
+    `server.reviews` reviews and /fetchDealers `server.dealers` dealers (both
+    honouring ?limit=&cursor=); /fetchDealers/<state> those in a state and
+    /fetchDealer/<id> one.
+    """
+
+    def do_GET(self):
+        self._sleep()
+        self._send_json(*backend_get(self.server, self.path))
+
+    def do_POST(self):
+        self._sleep()
+        length = int(self.headers.get("Content-Length") or 0)
+        self._send_json(*backend_post(self.server, self.path, self.rfile.read(length)))
+
+
+def backend_get(server, target):
+    """(payload, status) for a GET on the backend stand-in."""
+    path = urlparse(target).path
+    query = parse_qs(urlparse(target).query)
+    if path == "/healthz":
+        return {"ok": True}, 200
+    m = re.fullmatch(r"/fetchReviews/dealer/(\d+)", path)
+    if m:
+        n = int(m.group(1))
+        return [make_review(i, n) for i in range(1, n + 1)], 200
+    if path == "/fetchReviews":
+        n = getattr(server, "reviews", 500)
+        first = int(query.get("cursor", ["0"])[0]) + 1
+        last = min(n, first - 1 + int(query.get("limit", [n])[0]))
+        return [make_review(i, i % 50 + 1) for i in range(first, last + 1)], 200
+    m = re.fullmatch(r"/fetchDealers/(\w+)", path)
+    if m:
+        n = getattr(server, "dealers", 50)
+        dealers = [make_dealer(i) for i in range(1, n + 1)]
+        return [d for d in dealers if d["state"].lower() == m.group(1).lower()], 200
+    if path == "/fetchDealers":
+        n = getattr(server, "dealers", 50)
+        first = int(query.get("cursor", ["0"])[0]) + 1
+        last = min(n, first - 1 + int(query.get("limit", [n])[0]))
+        return [make_dealer(i) for i in range(first, last + 1)], 200
+    m = re.fullmatch(r"/fetchDealer/(\d+)", path)
+    if m:
+        return make_dealer(int(m.group(1))), 200
+    return {"error": "not found"}, 404
+
+
+def backend_post(server, target, body):
+    """(payload, status) for a POST on the backend stand-in."""
+    path = urlparse(target).path
+    data = json.loads(body or b"{}")
+    if path == "/updateSentiments":
+        return {"updated": len(data.get("items") or [])}, 200
+    if path != "/insert_review":
+        return {"error": "not found"}, 404
+    server.inserted = getattr(server, "inserted", 0) + 1
+    data["id"] = 100000 + server.inserted
+    return data, 201
+
+
+def _fake_label(text: str) -> str:
+    return "positive" if "Great" in text else "neutral"
+
+
+class SentimentHandler(_Handler):
+    """
+    GET /analyze/<text> and POST /analyze/batch (at most 1000 items, as the
+    analyzer); a `slow_ratio` share of
+    calls take `slow` seconds. Set `outage` to "hang" (every call takes
+    `slow` seconds) or "503" to simulate the analyzer being down.
+    """
+
+    def _outage(self):
+        if self.server.outage == "hang":
+            time.sleep(self.server.slow)
+        elif self.server.outage == "503":
+            self._send_json({"error": "unavailable"}, status=503)
+            return True
+        return False
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/analyze/batch":
+            return self._send_json({"error": "not found"}, status=404)
+        items = (self._read_json() or {}).get("items") or []
+        if len(items) > 1000:  # the analyzer's MAX_BATCH
+            return self._send_json({"error": "at most 1000 items per batch"}, status=413)
+        if self._outage():
+            return None
+        self._sleep()
+        return self._send_json({"results": [
+            {"id": it.get("id"), "sentiment": _fake_label(it.get("text") or "")}
+            for it in items
+        ]})
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if not path.startswith("/analyze/"):
+            return self._send_json({"error": "not found"}, status=404)
+        if self._outage():
+            return None
+        if random.random() < self.server.slow_ratio:
+            time.sleep(self.server.slow)
+        else:
+            self._sleep()
+        text = unquote(path[len("/analyze/"):])  # as Flask: "+" stays "+"
+        return self._send_json({"sentiment": _fake_label(text)})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+    connections = 0  # TCP connections accepted, to show keep-alive reuse
+    requests = 0  # responses sent, to show coalescing
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # Clients that gave up (deadline hit) close the socket early.
+        pass
+
+
+def serve(handler, latency=(0.0, 0.0), **attrs):
+    """Start `handler` on a free port; returns (server, base_url)."""
+    server = _Server(("127.0.0.1", 0), handler)
+    server.latency = latency
+    server.slow_ratio = 0.0
+    server.slow = 0.0
+    server.outage = None
+    for k, v in attrs.items():
+        setattr(server, k, v)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+class AsyncBackend:
+    """
+    The backend stand-in on one asyncio event loop, for load tests: the
+    latency is an asyncio.sleep, so hundreds of requests can be in flight
+    at once (ThreadingHTTPServer tops out near 100-130 req/s under a few
+    hundred clients). GET /__stats returns, and resets, the request count
+    and the peak number of requests in flight.
+    """
+
+    def __init__(self, latency=(0.0, 0.0)):
+        self.latency = latency
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def _respond(self, method, target, body):
+        if urlparse(target).path == "/__stats":
+            stats = {"requests": self.requests, "peak_in_flight": self.peak_in_flight}
+            self.requests = self.peak_in_flight = 0
+            return stats, 200
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            lo, hi = self.latency
+            if hi > 0:
+                await asyncio.sleep(random.uniform(lo, hi))
+            if method == "POST":
+                return backend_post(self, target, body)
+            return backend_get(self, target)
+        finally:
+            self.in_flight -= 1
+
+    async def _connection(self, reader, writer):
+        # Minimal HTTP/1.1 with keep-alive: enough for requests and httpx.
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, target, _ = line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+                payload, status = await self._respond(method, target, body)
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_forever(self, port=0):
+        server = await asyncio.start_server(self._connection, "127.0.0.1", port, backlog=1024)
+        print(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+if __name__ == "__main__":
+    # Run one stand-in in the foreground, e.g. for the load tests:
+    #   python benchmarks/standins.py backend --async --port 3030 --latency-ms 50
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("kind", choices=["backend", "sentiment"])
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="serve the backend from an asyncio loop (AsyncBackend)")
+    args = parser.parse_args()
+
+    lat = args.latency_ms / 1000.0
+    if args.use_async and args.kind == "backend":
+        asyncio.run(AsyncBackend(latency=(lat, lat)).serve_forever(args.port))
+    else:
+        handler = BackendHandler if args.kind == "backend" else SentimentHandler
+        server = _Server(("127.0.0.1", args.port), handler)
+        server.latency = (lat, lat)
+        server.slow_ratio = 0.0
+        server.slow = 0.0
+        server.outage = None
+        print(f"http://127.0.0.1:{server.server_address[1]}", flush=True)
+        server.serve_forever()
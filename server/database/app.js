@@ -18,20 +18,45 @@ const dealershipsPath = path.join(__dirname, "data", "dealerships.json");
 const reviewsSeed = JSON.parse(fs.readFileSync(reviewsPath, "utf8"));
 const dealershipsSeed = JSON.parse(fs.readFileSync(dealershipsPath, "utf8"));
 
+const SENTIMENTS = new Set(["positive", "negative", "neutral"]);
+
 // Store data in memory for simple operation without MongoDB
 let reviews = reviewsSeed.reviews || [];
 let dealerships = dealershipsSeed.dealerships || [];
 
 console.log(`[api] Loaded ${reviews.length} reviews and ${dealerships.length} dealerships from files`);
 
+// ---------- paging ----------
+// ?cursor=<last id>&limit=<n> returns the next n items ordered by id;
+// ?fields=a,b projects each item. Without params the full array is returned.
+function page(items, query) {
+  let out = items;
+  const limit = Number(query.limit);
+  const cursor = Number(query.cursor);
+  if (query.limit !== undefined || query.cursor !== undefined) {
+    out = [...out].sort((a, b) => (a.id || 0) - (b.id || 0));
+    if (Number.isFinite(cursor)) out = out.filter(item => (item.id || 0) > cursor);
+    if (Number.isFinite(limit) && limit > 0) out = out.slice(0, limit);
+  }
+  if (query.fields) {
+    const fields = String(query.fields).split(",").map(f => f.trim()).filter(Boolean);
+    out = out.map(item => {
+      const picked = {};
+      for (const f of fields) if (f in item) picked[f] = item[f];
+      return picked;
+    });
+  }
+  return out;
+}
+
 // ---------- routes ----------
 app.get("/", (_req, res) => res.send("Welcome to the JSON API"));
 app.get("/healthz", (_req, res) => res.json({ ok: true }));
 
 // --- Reviews ---
-app.get("/fetchReviews", (_req, res) => {
+app.get("/fetchReviews", (req, res) => {
   try {
-    res.json(reviews);
+    res.json(page(reviews, req.query));
   } catch {
     res.status(500).json({ error: "Error fetching reviews" });
   }
@@ -41,16 +66,16 @@ app.get("/fetchReviews/dealer/:id", (req, res) => {
   try {
     const dealerId = Number(req.params.id);
     const filteredReviews = reviews.filter(review => review.dealership === dealerId);
-    res.json(filteredReviews);
+    res.json(page(filteredReviews, req.query));
   } catch {
     res.status(500).json({ error: "Error fetching reviews" });
   }
 });
 
 // --- Dealers ---
-app.get("/fetchDealers", (_req, res) => {
+app.get("/fetchDealers", (req, res) => {
   try {
-    res.json(dealerships);
+    res.json(page(dealerships, req.query));
   } catch {
     res.status(500).json({ error: "Error fetching dealerships" });
   }
@@ -62,7 +87,7 @@ app.get("/fetchDealers/:state", (req, res) => {
     const filteredDealers = dealerships.filter(dealer => 
       dealer.state === state || dealer.state.toLowerCase() === state.toLowerCase()
     );
-    res.json(filteredDealers);
+    res.json(page(filteredDealers, req.query));
   } catch {
     res.status(500).json({ error: "Error fetching dealerships" });
   }
@@ -97,6 +122,8 @@ app.post("/insert_review", (req, res) => {
     const car_make = (data.car_make ?? "").toString().trim();
     const car_model = (data.car_model ?? "").toString().trim();
     const car_year = data.car_year === "" || data.car_year == null ? null : Number(data.car_year);
+    // sentiment is computed by Django at ingest; keep it only if it is a known label
+    const sentiment = SENTIMENTS.has(data.sentiment) ? data.sentiment : undefined;
 
     // next incremental id
     const maxId = reviews.length > 0 ? Math.max(...reviews.map(r => r.id || 0)) : 0;
@@ -113,6 +140,7 @@ app.post("/insert_review", (req, res) => {
       car_model,
       car_year,
     };
+    if (sentiment) newReview.sentiment = sentiment;
 
     reviews.push(newReview);
     res.status(201).json(newReview);
@@ -121,6 +149,26 @@ app.post("/insert_review", (req, res) => {
   }
 });
 
+// --- Store sentiments for existing reviews (Django backfill command) ---
+// Body: {"items": [{"id": 1, "sentiment": "positive"}, ...]}
+app.post("/updateSentiments", (req, res) => {
+  try {
+    const items = Array.isArray(req.body) ? req.body : (req.body && req.body.items) || [];
+    const byId = new Map(reviews.map(r => [r.id, r]));
+    let updated = 0;
+    for (const item of items) {
+      const review = byId.get(Number(item && item.id));
+      if (review && SENTIMENTS.has(item.sentiment)) {
+        review.sentiment = item.sentiment;
+        updated += 1;
+      }
+    }
+    res.json({ updated });
+  } catch (err) {
+    res.status(400).json({ error: "Error updating sentiments", details: err.message });
+  }
+});
+
 // ---------- start ----------
 app.listen(PORT, "0.0.0.0", () =>
   console.log(`[api] Server is running on http://0.0.0.0:${PORT}`)
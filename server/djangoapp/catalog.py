@@ -0,0 +1,110 @@
+# server/djangoapp/catalog.py
+"""
+Car catalog queries for get_cars.
+
+Filtering (make, type, year range, dealer_id) runs in the database against
+the CarModel indexes, rows come back as plain dicts via .values(), and
+each distinct filter combination is cached in the "catalog" cache alias
+under the current catalog version. Saving or deleting a CarMake/CarModel
+bumps the version (djangoapp/signals.py), so stale entries are never read.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.functions import Upper
+
+from .models import CarMake, CarModel
+
+_VERSION_KEY = "cars:version"
+
+FILTERS = ("make", "type", "year_min", "year_max", "dealer_id")
+
+
+def _cache():
+    return caches["catalog"]
+
+
+def catalog_version() -> int:
+    cache = _cache()
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        cache.add(_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    cache = _cache()
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def parse_filters(params) -> dict:
+    """Filters from a QueryDict; raises ValueError on bad numbers."""
+    filters = {}
+    for name in FILTERS:
+        value = (params.get(name) or "").strip()
+        if not value:
+            continue
+        if name in ("year_min", "year_max", "dealer_id"):
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError(f"{name} must be an integer")
+        elif name == "type":
+            value = value.upper()
+        filters[name] = value
+    if "year" in params and params.get("year"):
+        try:
+            filters["year_min"] = filters["year_max"] = int(params["year"])
+        except ValueError:
+            raise ValueError("year must be an integer")
+    return filters
+
+
+def _query(filters):
+    qs = CarModel.objects.all()
+    if "make" in filters:
+        # Not name__iexact: that is LIKE on SQLite and UPPER(name) = UPPER(%s)
+        # on PostgreSQL, neither of which can use carmake_name_upper_idx.
+        make_ids = (CarMake.objects.alias(upper_name=Upper("name"))
+                    .filter(upper_name=filters["make"].upper()).values("id"))
+        qs = qs.filter(car_make_id__in=make_ids)
+    if "type" in filters:
+        qs = qs.filter(type=filters["type"])
+    if "year_min" in filters:
+        qs = qs.filter(year__gte=filters["year_min"])
+    if "year_max" in filters:
+        qs = qs.filter(year__lte=filters["year_max"])
+    if "dealer_id" in filters:
+        qs = qs.filter(dealer_id=filters["dealer_id"])
+    rows = qs.order_by("id").values_list(
+        "name", "car_make__name", "type", "year", "dealer_id"
+    )
+    return [
+        {"CarModel": name, "CarMake": make, "type": type_, "year": year,
+         "dealer_id": dealer_id}
+        for name, make, type_, year, dealer_id in rows
+    ]
+
+
+def get_cars(filters=None):
+    """Catalog rows matching `filters`, served from the versioned cache."""
+    filters = filters or {}
+    if settings.CATALOG_CACHE_TTL <= 0:
+        return _query(filters)
+
+    key = "cars:v{}:{}".format(
+        catalog_version(),
+        "&".join(f"{k}={filters[k]}" for k in sorted(filters)).lower(),
+    )
+    cache = _cache()
+    cars = cache.get(key)
+    if cars is None:
+        cars = _query(filters)
+        cache.set(key, cars, timeout=settings.CATALOG_CACHE_TTL)
+    return cars
@@ -0,0 +1,81 @@
+# server/djangoapp/codec.py
+"""
+JSON encoding and decoding for the views and restapis.
+
+Uses orjson when it is installed (several times faster both ways and
+returns bytes directly) and the stdlib json module otherwise;
+JSON_CODEC=stdlib forces the fallback. Both sides accept the same input:
+anything orjson cannot encode natively (Decimal, lazy translation
+strings, ints beyond 64 bits) goes through DjangoJSONEncoder, as with
+django.http.JsonResponse. Decode errors are json.JSONDecodeError (a
+ValueError) either way.
+
+orjson writes compact JSON ({"a":1}); the stdlib path keeps Django's
+default spacing ({"a": 1}). Clients parse it, so only byte-for-byte
+comparisons notice.
+"""
+
+import json
+import os
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from . import profiling
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib path is used instead
+    orjson = None
+
+if os.environ.get("JSON_CODEC", "").strip().lower() == "stdlib":
+    orjson = None
+
+NAME = "orjson" if orjson is not None else "stdlib"
+
+_django_default = DjangoJSONEncoder().default
+
+if orjson is not None:
+    _OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj, sort_keys: bool = False) -> bytes:
+        opts = _OPTS | orjson.OPT_SORT_KEYS if sort_keys else _OPTS
+        try:
+            return orjson.dumps(obj, default=_django_default, option=opts)
+        except TypeError:
+            # e.g. an int beyond 64 bits; the stdlib takes anything
+            return json.dumps(obj, cls=DjangoJSONEncoder, sort_keys=sort_keys).encode("utf-8")
+
+    def loads(data):
+        return orjson.loads(data)
+else:
+    def dumps(obj, sort_keys: bool = False) -> bytes:
+        return json.dumps(obj, cls=DjangoJSONEncoder, sort_keys=sort_keys).encode("utf-8")
+
+    def loads(data):
+        return json.loads(data)
+
+
+class JsonResponse(HttpResponse):
+    """
+    django.http.JsonResponse encoded with dumps(), reporting its
+    serialization time to the request profile. A custom `encoder` or
+    `json_dumps_params` falls back to the stdlib encoder.
+    """
+
+    def __init__(self, data, encoder=None, safe=True, json_dumps_params=None, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+        kwargs.setdefault("content_type", "application/json")
+        t0 = time.perf_counter()
+        if encoder is None and json_dumps_params is None:
+            content = dumps(data)
+        else:
+            content = json.dumps(data, cls=encoder or DjangoJSONEncoder,
+                                 **(json_dumps_params or {}))
+        profiling.add("json", time.perf_counter() - t0)
+        super().__init__(content=content, **kwargs)
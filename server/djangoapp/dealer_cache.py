@@ -0,0 +1,198 @@
+# server/djangoapp/dealer_cache.py
+"""
+Server-side response cache for the dealer list and dealer detail views.
+
+Rendered JSON bodies are kept in the "dealers" cache alias for
+settings.DEALER_CACHE_TTL seconds, one entry per state (and one for "All",
+plus one per page/projection asked for) and one per dealer id. Every response carries an ETag and Last-Modified
+so the browser can revalidate and get a bodiless 304 back.
+
+A view's build function returns either the payload dict or an already
+rendered JSON body (bytes), which is stored and served as is; see
+envelope().
+
+Invalidate with invalidate_dealers() or `manage.py invalidate_dealer_cache`.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from . import codec
+from .codec import JsonResponse
+
+_GEN_KEY = "dealers:gen"
+
+
+def _cache():
+    return caches["dealers"]
+
+
+def _new_generation() -> int:
+    # Seeded from the clock so a lost counter never revives old entries.
+    return int(time.time() * 1000)
+
+
+def _generation(cache) -> int:
+    # Bumping the generation drops every entry at once without a scan.
+    gen = cache.get(_GEN_KEY)
+    if gen is None:
+        cache.add(_GEN_KEY, _new_generation(), timeout=None)
+        gen = cache.get(_GEN_KEY)
+    return gen
+
+
+def list_key(state, query="") -> str:
+    state = "all" if state in (None, "", "All") else str(state).lower()
+    return f"list:{state}?{query}" if query else f"list:{state}"
+
+
+def detail_key(dealer_id) -> str:
+    return f"dealer:{int(dealer_id)}"
+
+
+def envelope(key: str, body: bytes) -> bytes:
+    """
+    {"status": 200, <key>: <body>} around upstream JSON bytes, without
+    decoding or re-encoding them. The wrapper comes from the codec, so it
+    is spaced exactly as a JsonResponse of the same payload would be.
+    """
+    shell = codec.dumps({"status": 200, key: None})
+    return shell[:-len(b"null}")] + body + b"}"
+
+
+def _render(payload):
+    if isinstance(payload, bytes):
+        return HttpResponse(payload, content_type="application/json")
+    return JsonResponse(payload)
+
+
+def make_entry(payload, last_modified=None) -> dict:
+    """A cacheable response: rendered body, ETag and Last-Modified (epoch seconds)."""
+    body = payload if isinstance(payload, bytes) else JsonResponse(payload).content
+    return {
+        "body": body,
+        "etag": '"%s"' % hashlib.sha1(body).hexdigest(),
+        "last_modified": int(time.time() if last_modified is None else last_modified),
+    }
+
+
+def respond(request, entry):
+    """The response for a make_entry() entry, or a 304 if the client has it."""
+    response = HttpResponse(entry["body"], content_type="application/json")
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    # Let the browser keep a copy but revalidate it on every fetch.
+    response["Cache-Control"] = "no-cache"
+    return get_conditional_response(
+        request,
+        etag=entry["etag"],
+        last_modified=entry["last_modified"],
+        response=response,
+    )
+
+
+def cached_response(request, key, build):
+    """
+    Serve `key` from the cache, or call `build()` for the payload dict.
+    `build` returns None when the upstream failed; that is not cached.
+    """
+    if settings.DEALER_CACHE_TTL <= 0:
+        payload = build()
+        return _render(payload) if payload is not None else None
+
+    cache = _cache()
+    full_key = f"dealers:v{_generation(cache)}:{key}"
+    entry = cache.get(full_key)
+    if entry is None:
+        payload = build()
+        if payload is None:
+            return None
+        entry = make_entry(payload)
+        cache.set(full_key, entry, timeout=settings.DEALER_CACHE_TTL)
+    return respond(request, entry)
+
+
+async def acached_response(request, key, abuild):
+    """cached_response for the async views; `abuild` is a coroutine function."""
+    if settings.DEALER_CACHE_TTL <= 0:
+        payload = await abuild()
+        return _render(payload) if payload is not None else None
+
+    cache = _cache()
+    gen = await cache.aget(_GEN_KEY)
+    if gen is None:
+        await cache.aadd(_GEN_KEY, _new_generation(), timeout=None)
+        gen = await cache.aget(_GEN_KEY)
+    full_key = f"dealers:v{gen}:{key}"
+    entry = await cache.aget(full_key)
+    if entry is None:
+        payload = await abuild()
+        if payload is None:
+            return None
+        entry = make_entry(payload)
+        await cache.aset(full_key, entry, timeout=settings.DEALER_CACHE_TTL)
+    return respond(request, entry)
+
+
+def cached_payload(key, build):
+    """
+    The payload dict behind `key` for views that embed it in a larger
+    response (the dealer page). Shares entries with cached_response.
+    """
+    if settings.DEALER_CACHE_TTL <= 0:
+        return build()
+
+    cache = _cache()
+    full_key = f"dealers:v{_generation(cache)}:{key}"
+    entry = cache.get(full_key)
+    if entry is None:
+        payload = build()
+        if payload is not None:
+            cache.set(full_key, make_entry(payload), timeout=settings.DEALER_CACHE_TTL)
+        return payload
+    return codec.loads(entry["body"])
+
+
+async def acached_payload(key, abuild):
+    """cached_payload for the async views; `abuild` is a coroutine function."""
+    if settings.DEALER_CACHE_TTL <= 0:
+        return await abuild()
+
+    cache = _cache()
+    gen = await cache.aget(_GEN_KEY)
+    if gen is None:
+        await cache.aadd(_GEN_KEY, _new_generation(), timeout=None)
+        gen = await cache.aget(_GEN_KEY)
+    full_key = f"dealers:v{gen}:{key}"
+    entry = await cache.aget(full_key)
+    if entry is None:
+        payload = await abuild()
+        if payload is not None:
+            await cache.aset(full_key, make_entry(payload), timeout=settings.DEALER_CACHE_TTL)
+        return payload
+    return codec.loads(entry["body"])
+
+
+def invalidate_dealers(dealer_id=None):
+    """
+    Drop cached dealer responses: one dealer's details, or with no
+    `dealer_id` everything. Lists are not dropped one state at a time:
+    the "All" and ?zip= lists cut across states, every list is also keyed
+    by paging/projection params, and they are cheap to rebuild.
+    """
+    cache = _cache()
+    if dealer_id is not None:
+        gen = _generation(cache)
+        cache.delete(f"dealers:v{gen}:{detail_key(dealer_id)}")
+        return
+
+    try:
+        cache.incr(_GEN_KEY)
+    except ValueError:
+        cache.set(_GEN_KEY, _new_generation(), timeout=None)
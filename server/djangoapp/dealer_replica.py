@@ -0,0 +1,237 @@
+# server/djangoapp/dealer_replica.py
+"""
+Local, indexed replica of the backend's dealerships.
+
+sync() (`manage.py sync_dealers`, once at start-up and then on a
+schedule with --every) pages through /fetchDealers and upserts every
+dealer into the Dealership table in one transaction, dropping the ones
+the backend no longer has. A failed or empty fetch leaves the table as
+it was (--allow-empty lets an empty one clear it).
+
+Each worker keeps an Index built from the table:
+
+    by_id      id -> dealer dict
+    by_state   state.lower() -> [dealers], id order
+    by_zip     zip -> [dealers], id order
+
+Responses for ids and whole states are rendered once, on first use, with
+ETags, so a hit is a dict lookup; the KD-tree for nearest-dealer search
+(geo.py) is built on first use as well. current() re-reads the table when a
+newer sync has landed, checking at most every CHECK_INTERVAL seconds.
+
+Views use the replica while the last sync is younger than
+settings.DEALER_REPLICA_MAX_AGE. Past that they go to the backend, and
+fall back to the replica only if the backend fails, so a short backend
+outage does not take the dealer pages down.
+"""
+
+import logging
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import codec, geo
+from .dealer_cache import envelope, make_entry
+from .models import Dealership
+from .restapis import get_request
+
+logger = logging.getLogger(__name__)
+
+CHECK_INTERVAL = 2.0
+PAGE_SIZE = 1000
+
+_FIELDS = ("full_name", "city", "state", "state_key", "st", "zip", "lat", "lon", "doc")
+
+
+class ReplicaError(Exception):
+    pass
+
+
+class Index:
+    def __init__(self, docs, synced_at):
+        """`docs`: (id, state_key, zip, doc JSON) rows in id order."""
+        self.synced_at = synced_at
+        self.by_id = {}
+        self.by_state = {}
+        self.by_zip = {}
+        self._raw = {}
+        self._entries = {}
+        self._tree = None
+        self._tree_lock = threading.Lock()
+        for pk, state_key, zip_code, doc in docs:
+            dealer = codec.loads(doc)
+            self.by_id[pk] = dealer
+            self._raw[pk] = doc.encode("utf-8")
+            self.by_state.setdefault(state_key, []).append(dealer)
+            if zip_code:
+                self.by_zip.setdefault(zip_code, []).append(dealer)
+        self.dealers = list(self.by_id.values())
+
+    def age(self) -> float:
+        return (timezone.now() - self.synced_at).total_seconds()
+
+    def fresh(self) -> bool:
+        return self.age() < settings.DEALER_REPLICA_MAX_AGE
+
+    def dealers_for(self, state=None, zip_code=None):
+        """Dealers in `state` (any case; None/"All" for every state) and/or `zip`."""
+        if zip_code:
+            found = self.by_zip.get(zip_code, [])
+            if state in (None, "", "All"):
+                return found
+            return [d for d in found if str(d.get("state", "")).lower() == state.lower()]
+        if state in (None, "", "All"):
+            return self.dealers
+        return self.by_state.get(state.lower(), [])
+
+    def _entry(self, key, build):
+        # Rendered on first use; racing threads just render it twice.
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = make_entry(build(), self.synced_at.timestamp())
+        return entry
+
+    def list_entry(self, state=None):
+        """Cache entry for the unpaged dealer list of `state` (or all)."""
+        dealers = self.dealers_for(state)
+        key = ("list", "" if state in (None, "", "All") else state.lower())
+        return self._entry(key, lambda: envelope(
+            "dealers", b"[" + b", ".join(self._raw[d["id"]] for d in dealers) + b"]"
+        ))
+
+    def tree(self):
+        """geo.KDTree over every dealer, built once, on first use."""
+        if self._tree is None:
+            with self._tree_lock:
+                if self._tree is None:
+                    self._tree = geo.KDTree(self.dealers)
+        return self._tree
+
+    async def atree(self):
+        """tree() for the async views; a first build runs off the event loop."""
+        if self._tree is not None:
+            return self._tree
+        return await sync_to_async(self.tree, thread_sensitive=False)()
+
+    def detail_entry(self, dealer_id):
+        """Cache entry for one dealer, or None if the replica does not have it."""
+        if dealer_id not in self._raw:
+            return None
+        return self._entry(("dealer", dealer_id),
+                           lambda: envelope("dealer", self._raw[dealer_id]))
+
+
+_index = None
+_checked = 0.0
+_lock = threading.Lock()
+
+
+def _load(stamp):
+    docs = Dealership.objects.order_by("id").values_list("id", "state_key", "zip", "doc")
+    return Index(docs.iterator(chunk_size=2000), stamp)
+
+
+def current():
+    """The Index, re-read if a newer sync landed; None before the first sync."""
+    global _index, _checked
+    if time.monotonic() - _checked < CHECK_INTERVAL:
+        return _index
+    with _lock:
+        if time.monotonic() - _checked < CHECK_INTERVAL:
+            return _index
+        try:
+            stamp = Dealership.objects.aggregate(m=Max("synced_at"))["m"]
+            if stamp is None:
+                _index = None
+            elif _index is None or _index.synced_at != stamp:
+                _index = _load(stamp)
+                logger.info("dealer replica loaded: %d dealers, synced %s",
+                            len(_index.dealers), stamp.isoformat())
+        except DatabaseError as e:
+            # Keep whatever we had (e.g. table not migrated yet, DB locked).
+            logger.warning("dealer replica check failed: %s", e)
+        _checked = time.monotonic()
+    return _index
+
+
+async def acurrent():
+    """current() for the async views; only touches the DB when a check is due."""
+    if time.monotonic() - _checked < CHECK_INTERVAL:
+        return _index
+    return await sync_to_async(current)()
+
+
+def reset():
+    """Forget the in-memory index; the next current() re-reads the table."""
+    global _index, _checked
+    with _lock:
+        _index, _checked = None, 0.0
+
+
+# ---------------------------------------------------------
+# Sync from the backend
+# ---------------------------------------------------------
+
+def _row(dealer, stamp):
+    try:
+        pk = int(dealer.get("id"))
+    except (TypeError, ValueError):
+        return None
+    state = str(dealer.get("state") or "")
+    return Dealership(
+        id=pk,
+        full_name=str(dealer.get("full_name") or "")[:200],
+        city=str(dealer.get("city") or "")[:100],
+        state=state[:64],
+        state_key=state.lower()[:64],
+        st=str(dealer.get("st") or "")[:8],
+        zip=str(dealer.get("zip") or "")[:16],
+        # lat/long are numbers in dealerships.json but strings in the Mongo schema.
+        lat=geo.coord(dealer.get("lat")),
+        lon=geo.coord(dealer.get("long", dealer.get("lon"))),
+        doc=codec.dumps(dealer).decode("utf-8"),
+        synced_at=stamp,
+    )
+
+
+def _fetch_all(page_size):
+    """Every dealer from the backend, keyset-paged by id."""
+    dealers, cursor = [], None
+    while True:
+        params = {"limit": page_size}
+        if cursor is not None:
+            params["cursor"] = cursor
+        batch = get_request("/fetchDealers", **params)
+        if not isinstance(batch, list):
+            raise ReplicaError(f"backend fetch failed after cursor {cursor}")
+        ids = [int(d.get("id") or 0) for d in batch]
+        # Ignore anything at or below the cursor, so a backend that does
+        # not page ends the walk instead of repeating it.
+        dealers.extend(d for d, i in zip(batch, ids) if cursor is None or i > cursor)
+        if len(batch) < page_size or not ids or max(ids) <= (cursor or 0):
+            return dealers
+        cursor = max(ids)
+
+
+def sync(page_size=PAGE_SIZE, allow_empty=False) -> dict:
+    """
+    Copy the backend's dealers into the replica; returns counts. No
+    dealers at all is taken as a failure (ReplicaError) unless
+    `allow_empty`: an empty reply would otherwise wipe the fallback.
+    """
+    stamp = timezone.now()
+    rows = [r for r in (_row(d, stamp) for d in _fetch_all(page_size)) if r is not None]
+    if not rows and not allow_empty:
+        raise ReplicaError("backend returned no dealers")
+    with transaction.atomic():
+        Dealership.objects.bulk_create(
+            rows, batch_size=500,
+            update_conflicts=True, unique_fields=["id"], update_fields=_FIELDS + ("synced_at",),
+        )
+        removed, _ = Dealership.objects.filter(synced_at__lt=stamp).delete()
+    return {"synced": len(rows), "removed": removed}
@@ -0,0 +1,157 @@
+# server/djangoapp/export.py
+"""
+Bulk export of every review, with its sentiment, as NDJSON or CSV.
+
+A generator pipeline that holds one page at a time, so memory stays flat
+however many reviews there are:
+
+    pages()   /fetchReviews in id order, EXPORT_PAGE_SIZE at a time
+    score()   labels reviews stored without a sentiment, one analyzer
+              batch per page (through the sentiment cache)
+    render    one bytes chunk per page (NDJSON lines or CSV rows)
+
+stream() / astream() chain them for the export view (sync / ASGI) and
+`manage.py export_reviews`. A backend failure part way raises
+ExportError; the rows already written stay valid.
+"""
+
+import csv
+import io
+import os
+
+from . import codec
+from .restapis import (
+    async_get_request,
+    async_get_review_sentiments,
+    get_request,
+    get_review_sentiments,
+)
+
+PAGE_SIZE = max(1, int(os.environ.get("EXPORT_PAGE_SIZE", "500")))
+
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+# CSV columns; NDJSON lines carry every field the backend stores.
+CSV_FIELDS = (
+    "id", "dealership", "name", "review", "sentiment", "purchase",
+    "purchase_date", "car_make", "car_model", "car_year", "time",
+)
+
+
+class ExportError(Exception):
+    pass
+
+
+def _params(page_size, cursor):
+    params = {"limit": page_size}
+    if cursor is not None:
+        params["cursor"] = cursor
+    return params
+
+
+def _id(review):
+    try:
+        return int(review.get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _advance(batch, cursor, page_size):
+    """
+    (rows of `batch` past `cursor`, cursor for the next page or None when
+    this was the last). A backend that ignores limit/cursor returns
+    every review each time; dropping what the cursor has passed and
+    stopping once a page brings nothing new exports them once, instead
+    of forever.
+    """
+    ids = [_id(r) for r in batch]
+    rows = batch if cursor is None else [r for r, i in zip(batch, ids) if i > cursor]
+    if len(batch) < page_size or not rows:
+        return rows, None
+    top = max(ids)
+    return rows, (top if cursor is None or top > cursor else None)
+
+
+def pages(page_size=PAGE_SIZE):
+    """Raw review pages from the backend, in id order."""
+    cursor = None
+    while True:
+        batch = get_request("/fetchReviews", **_params(page_size, cursor))
+        if not isinstance(batch, list):
+            raise ExportError(f"backend fetch failed after cursor {cursor}")
+        rows, cursor = _advance(batch, cursor, page_size)
+        if rows:
+            yield rows
+        if cursor is None:
+            return
+
+
+async def apages(page_size=PAGE_SIZE):
+    cursor = None
+    while True:
+        batch = await async_get_request("/fetchReviews", **_params(page_size, cursor))
+        if not isinstance(batch, list):
+            raise ExportError(f"backend fetch failed after cursor {cursor}")
+        rows, cursor = _advance(batch, cursor, page_size)
+        if rows:
+            yield rows
+        if cursor is None:
+            return
+
+
+def _unscored(batch):
+    return [r for r in batch if not r.get("sentiment")]
+
+
+def score(batch):
+    """Fill in missing sentiments on one page, in place."""
+    todo = _unscored(batch)
+    if todo:
+        labels = get_review_sentiments([r.get("review") for r in todo])
+        for r, label in zip(todo, labels):
+            r["sentiment"] = label
+    return batch
+
+
+async def ascore(batch):
+    todo = _unscored(batch)
+    if todo:
+        labels = await async_get_review_sentiments([r.get("review") for r in todo])
+        for r, label in zip(todo, labels):
+            r["sentiment"] = label
+    return batch
+
+
+def ndjson_chunk(batch) -> bytes:
+    return b"".join(codec.dumps(r) + b"\n" for r in batch)
+
+
+def csv_header() -> bytes:
+    return (",".join(CSV_FIELDS) + "\r\n").encode("utf-8")
+
+
+def csv_chunk(batch) -> bytes:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, CSV_FIELDS, extrasaction="ignore")
+    writer.writerows(batch)
+    return buf.getvalue().encode("utf-8")
+
+
+def stream(fmt="ndjson", page_size=PAGE_SIZE):
+    """Bytes chunks of the whole export in `fmt` ("ndjson" or "csv")."""
+    render = csv_chunk if fmt == "csv" else ndjson_chunk
+    if fmt == "csv":
+        yield csv_header()
+    for batch in pages(page_size):
+        yield render(score(batch))
+
+
+async def astream(fmt="ndjson", page_size=PAGE_SIZE):
+    render = csv_chunk if fmt == "csv" else ndjson_chunk
+    if fmt == "csv":
+        yield csv_header()
+    async for batch in apages(page_size):
+        yield render(await ascore(batch))
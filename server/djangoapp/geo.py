@@ -0,0 +1,170 @@
+# server/djangoapp/geo.py
+"""
+Nearest-dealer search.
+
+KDTree is built once over the dealers' coordinates, each mapped to a
+point on the unit sphere (x, y, z). Straight-line distance between those
+points orders them exactly as great-circle distance does, with no
+special cases at the poles or the antimeridian, and converts back to
+kilometres at the end (2R·asin(chord/2), the haversine distance).
+
+    tree = KDTree(dealers)                 # O(n log² n), skips dealers without coordinates
+    tree.nearest(lat, lon, k=10, radius_km=None) -> [(km, dealer)], nearest first
+
+Splits are on the widest axis at the median, down to leaves of LEAF_SIZE
+points scanned directly. A query visits the near side first and skips a
+far side the current k-th best (or the radius) cannot reach, keeping a
+bounded heap, so k-nearest over 100k dealers is well under a millisecond
+in plain Python.
+
+Dealer coordinates are "lat" and "long" (numbers in dealerships.json,
+strings in the Mongo schema); "lon" is accepted too.
+"""
+
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+LEAF_SIZE = 16
+DEFAULT_K = 10
+MAX_K = 100
+
+
+def coord(value):
+    """float(value), or None when it is missing, malformed or not finite."""
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return None
+    return f if math.isfinite(f) else None
+
+
+def _unit(lat, lon):
+    phi, lam = math.radians(lat), math.radians(lon)
+    c = math.cos(phi)
+    return (c * math.cos(lam), c * math.sin(lam), math.sin(phi))
+
+
+def _chord2(radius_km):
+    """Squared chord length for a great-circle distance (inf past half the globe)."""
+    if radius_km is None or radius_km >= math.pi * EARTH_RADIUS_KM:
+        return math.inf
+    return (2.0 * math.sin(radius_km / (2.0 * EARTH_RADIUS_KM))) ** 2
+
+
+def _km(chord2):
+    return 2.0 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(chord2) / 2.0))
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((p2 - p1) / 2) ** 2
+         + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2.0 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def dealer_coords(dealer):
+    """(lat, lon) of a dealer dict, or None."""
+    lat = coord(dealer.get("lat"))
+    lon = coord(dealer.get("long", dealer.get("lon")))
+    if lat is None or lon is None or not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        return None
+    return lat, lon
+
+
+class KDTree:
+    def __init__(self, dealers):
+        self.dealers = []
+        points = []
+        for dealer in dealers:
+            ll = dealer_coords(dealer)
+            if ll is not None:
+                points.append((*_unit(*ll), len(self.dealers)))
+                self.dealers.append(dealer)
+        self._root = self._build(points)
+
+    def __len__(self):
+        return len(self.dealers)
+
+    def _build(self, points):
+        # Leaf: ("leaf", points). Inner node: (axis, split, below, above).
+        if len(points) <= LEAF_SIZE:
+            return ("leaf", points)
+        spreads = [max(p[a] for p in points) - min(p[a] for p in points) for a in range(3)]
+        axis = spreads.index(max(spreads))
+        points.sort(key=lambda p: p[axis])
+        mid = len(points) // 2
+        return (axis, points[mid][axis], self._build(points[:mid]), self._build(points[mid:]))
+
+    def nearest(self, lat, lon, k=DEFAULT_K, radius_km=None):
+        """Up to `k` (km, dealer) pairs within `radius_km`, nearest first."""
+        if k <= 0:
+            return []
+        qx, qy, qz = q = _unit(lat, lon)
+        limit = _chord2(radius_km)
+        best = []  # max-heap of (-d2, index), at most k long
+
+        def visit(node):
+            if node[0] == "leaf":
+                for x, y, z, i in node[1]:
+                    d2 = (x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2
+                    if d2 <= limit and (len(best) < k or d2 < -best[0][0]):
+                        if len(best) < k:
+                            heapq.heappush(best, (-d2, i))
+                        else:
+                            heapq.heapreplace(best, (-d2, i))
+                return
+            axis, split, below, above = node
+            diff = q[axis] - split
+            near, far = (below, above) if diff < 0 else (above, below)
+            visit(near)
+            bound = -best[0][0] if len(best) == k else limit
+            if diff * diff <= bound:
+                visit(far)
+
+        visit(self._root)
+        return [(_km(-d2), self.dealers[i]) for d2, i in sorted(best, reverse=True)]
+
+
+# ---------------------------------------------------------
+# Query string
+# ---------------------------------------------------------
+
+def _number(params, name, lo, hi):
+    value = coord(params.get(name))
+    if value is None or not lo <= value <= hi:
+        raise ValueError(f"{name} must be a number between {lo} and {hi}")
+    return value
+
+
+def parse_query(params):
+    """{"lat", "lon", "k", "radius"} from ?lat=&lon=&k=&radius= (km). Raises ValueError."""
+    query = {
+        "lat": _number(params, "lat", -90, 90),
+        "lon": _number(params, "lon", -180, 180),
+        "k": DEFAULT_K,
+        "radius": None,
+    }
+    radius = params.get("radius")
+    if radius not in (None, ""):
+        query["radius"] = coord(radius)
+        if query["radius"] is None or query["radius"] <= 0:
+            raise ValueError("radius must be a positive number of km")
+    k = params.get("k")
+    if k not in (None, ""):
+        try:
+            query["k"] = int(k)
+        except ValueError:
+            raise ValueError("k must be an integer")
+        if not 1 <= query["k"] <= MAX_K:
+            raise ValueError(f"k must be between 1 and {MAX_K}")
+    return query
+
+
+def payload(tree, query):
+    """The endpoint's response body: dealers nearest first, with distance_km."""
+    found = tree.nearest(query["lat"], query["lon"], query["k"], query["radius"])
+    return {
+        "status": 200,
+        "dealers": [{**dealer, "distance_km": round(km, 3)} for km, dealer in found],
+    }
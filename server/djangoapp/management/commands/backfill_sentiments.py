@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoapp.paging import backend_params, paginate
+from djangoapp.restapis import get_request, get_review_sentiments, post_sentiments
+
+# All the backfill needs of a review.
+REVIEW_FIELDS = ("id", "review", "sentiment")
+
+
+class Command(BaseCommand):
+    help = (
+        "Score every stored review that has no sentiment yet and save the "
+        "labels on the backend, a page of reviews at a time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200,
+                            help="Reviews fetched, scored and saved per page.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Score but do not write anything back.")
+
+    def pages(self, size):
+        """/fetchReviews in id order, `size` reviews at a time (limit/cursor)."""
+        page = {"limit": size, "cursor": None, "fields": list(REVIEW_FIELDS)}
+        while True:
+            batch = get_request("/fetchReviews", **backend_params(page, REVIEW_FIELDS))
+            if not isinstance(batch, list):
+                raise CommandError(
+                    f"Could not fetch reviews from the backend after cursor {page['cursor']}."
+                )
+            # Re-applied here as well, in case the backend ignores the params.
+            items, next_cursor = paginate(batch, page)
+            yield items
+            if next_cursor is None:
+                return
+            page["cursor"] = int(next_cursor)
+
+    def handle(self, *args, **options):
+        size = max(1, options["batch_size"])
+        seen = saved = skipped = 0
+        for reviews in self.pages(size):
+            seen += len(reviews)
+            todo = [r for r in reviews if not r.get("sentiment") and r.get("id") is not None]
+            if not todo:
+                continue
+            labels = get_review_sentiments([r.get("review") for r in todo], fallback=None)
+            items = [
+                {"id": r["id"], "sentiment": label}
+                for r, label in zip(todo, labels) if label
+            ]
+            skipped += len(todo) - len(items)
+            if items and not options["dry_run"]:
+                resp = post_sentiments(items)
+                if not isinstance(resp, dict):
+                    raise CommandError(
+                        f"Backend rejected the batch ending at review {todo[-1]['id']}; "
+                        f"{saved} reviews saved so far."
+                    )
+                saved += resp.get("updated", len(items))
+            elif options["dry_run"]:
+                saved += len(items)
+            self.stdout.write(f"  {seen} reviews read, {len(todo)} scored in this page")
+
+        verb = "would be saved" if options["dry_run"] else "saved"
+        self.stdout.write(self.style.SUCCESS(
+            f"{saved} sentiments {verb} of {seen} reviews; {skipped} left for a "
+            f"later run (analyzer unavailable)."
+        ))
@@ -0,0 +1,34 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoapp import export
+
+
+class Command(BaseCommand):
+    help = (
+        "Write every review with its sentiment as NDJSON or CSV, fetched "
+        "from the backend page by page and scored in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(export.FORMATS), default="ndjson")
+        parser.add_argument("--output", "-o", default="-",
+                            help="File to write (default: stdout).")
+        parser.add_argument("--page-size", type=int, default=export.PAGE_SIZE)
+
+    def handle(self, *args, **options):
+        out = sys.stdout.buffer if options["output"] == "-" else open(options["output"], "wb")
+        written = 0
+        try:
+            for chunk in export.stream(options["format"], max(1, options["page_size"])):
+                out.write(chunk)
+                written += len(chunk)
+        except export.ExportError as e:
+            raise CommandError(f"{e}; {written} bytes written before the failure.")
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+            else:
+                out.flush()
+        self.stderr.write(self.style.SUCCESS(f"{written} bytes exported."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from djangoapp.dealer_cache import invalidate_dealers
+
+
+class Command(BaseCommand):
+    help = "Drop cached dealer list/detail responses (everything, or one dealer)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dealer", type=int, help="Only this dealer's details.")
+
+    def handle(self, *args, **options):
+        invalidate_dealers(dealer_id=options["dealer"])
+        scope = f"dealer={options['dealer']}" if options["dealer"] else "everything"
+        self.stdout.write(self.style.SUCCESS(f"Dealer cache invalidated ({scope})."))
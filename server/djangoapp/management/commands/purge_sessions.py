@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.timezone import now
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions from django_session in small batches, so "
+        "each delete holds the write lock briefly. With --every, keep "
+        "running and purge on that interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--pause", type=float, default=0.05,
+                            help="Seconds between batches, to let requests write.")
+        parser.add_argument("--every", type=float, default=0,
+                            help="Repeat every N seconds (0 = run once).")
+
+    def purge(self, size, pause) -> int:
+        cutoff = now()
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                keys = list(
+                    Session.objects.filter(expire_date__lt=cutoff)
+                    .values_list("session_key", flat=True)[:size]
+                )
+                if keys:
+                    Session.objects.filter(session_key__in=keys).delete()
+            deleted += len(keys)
+            if len(keys) < size:
+                return deleted
+            time.sleep(pause)
+
+    def handle(self, *args, **options):
+        if not settings.SESSION_ENGINE.endswith("db"):
+            # The cache engines expire their entries themselves.
+            self.stdout.write(f"{settings.SESSION_ENGINE} keeps no session rows; nothing to do.")
+            return
+
+        size = max(1, options["batch_size"])
+        while True:
+            deleted = self.purge(size, options["pause"])
+            self.stdout.write(self.style.SUCCESS(f"{deleted} expired sessions deleted."))
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
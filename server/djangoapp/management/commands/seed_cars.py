@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoapp.models import CarModel
+from djangoapp.populate import BATCH_SIZE, initiate, iter_json_array, load_cars
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed the car catalog at deploy time. Without --file, loads the "
+        "built-in makes/models if the catalog is empty. With --file, "
+        "streams a car_records.json-shaped file in with bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="JSON file: {\"cars\": [...]} or a bare array.")
+        parser.add_argument("--key", default="cars",
+                            help="Top-level key holding the array ('' for a bare array).")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--replace", action="store_true",
+                            help="Delete existing car models first (same transaction).")
+
+    def handle(self, *args, **options):
+        if not options["file"]:
+            if CarModel.objects.exists():
+                self.stdout.write("Car catalog already seeded; nothing to do.")
+                return
+            initiate()
+            self.stdout.write(self.style.SUCCESS(
+                f"Seeded {CarModel.objects.count()} built-in car models."
+            ))
+            return
+
+        if CarModel.objects.exists() and not options["replace"]:
+            raise CommandError("Car catalog is not empty; pass --replace to reload it.")
+
+        t0 = time.perf_counter()
+        try:
+            with open(options["file"], encoding="utf-8") as fp:
+                created = load_cars(
+                    iter_json_array(fp, key=options["key"] or None),
+                    batch_size=max(1, options["batch_size"]),
+                    replace=options["replace"],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not load {options['file']}: {e}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {created} car models in {time.perf_counter() - t0:.2f}s."
+        ))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoapp import dealer_replica
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the backend's dealerships into the local replica table. With "
+        "--every, keep running and re-sync on that interval (failed runs "
+        "leave the replica as it was)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=dealer_replica.PAGE_SIZE)
+        parser.add_argument("--every", type=float, default=0,
+                            help="Repeat every N seconds (0 = run once).")
+        parser.add_argument("--allow-empty", action="store_true",
+                            help="Let a backend with no dealers empty the replica.")
+
+    def handle(self, *args, **options):
+        size = max(1, options["page_size"])
+        while True:
+            try:
+                counts = dealer_replica.sync(size, allow_empty=options["allow_empty"])
+            except dealer_replica.ReplicaError as e:
+                if not options["every"]:
+                    raise CommandError(f"{e}; replica left unchanged.")
+                self.stderr.write(f"{e}; replica left unchanged.")
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{counts['synced']} dealers synced, {counts['removed']} removed."
+                ))
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
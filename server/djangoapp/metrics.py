@@ -0,0 +1,106 @@
+# server/djangoapp/metrics.py
+"""
+In-process latency histograms for upstream calls, rendered in the
+Prometheus text format by the metrics view.
+
+restapis calls observe() once per HTTP call with the upstream name
+("backend" / "sentiment"), the endpoint template (ids and review text
+replaced by placeholders, so label sets stay small), the status code (or
+"error" when no response came back), the duration and the response size.
+
+Each gunicorn worker keeps its own numbers; Prometheus tells workers
+apart by the `pid` label the view adds. UPSTREAM_METRICS=0 turns
+collection off.
+"""
+
+import os
+import re
+import threading
+from bisect import bisect_left
+
+ENABLED = os.environ.get("UPSTREAM_METRICS", "1").strip() not in ("0", "false", "no")
+
+# Seconds; upper bounds of the histogram buckets (+Inf is implicit).
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_series = {}  # (upstream, method, endpoint, status) -> [bucket counts..., sum, count, bytes]
+
+_NUMBER = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(path: str) -> str:
+    """'/fetchReviews/dealer/15?x=1' -> '/fetchReviews/dealer/:id'."""
+    path = "/" + path.split("?", 1)[0].lstrip("/")
+    if path.startswith("/analyze/") and path != "/analyze/batch":
+        return "/analyze/:text"
+    return _NUMBER.sub("/:id", path)
+
+
+def observe(upstream, method, endpoint, status, seconds, nbytes=0):
+    if not ENABLED:
+        return
+    key = (upstream, method, endpoint, str(status))
+    i = bisect_left(BUCKETS, seconds)
+    with _lock:
+        row = _series.get(key)
+        if row is None:
+            row = _series[key] = [0] * (len(BUCKETS) + 4)
+        row[i] += 1  # i == len(BUCKETS) is the +Inf bucket
+        row[-3] += seconds
+        row[-2] += 1
+        row[-1] += nbytes
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {k: list(v) for k, v in _series.items()}
+
+
+def reset():
+    with _lock:
+        _series.clear()
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for k, v in labels.items():
+        v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def render(gauges=(), **const_labels) -> str:
+    """
+    Prometheus text exposition of the upstream histograms, plus `gauges`:
+    (name, help, type, [(labels dict, value), ...]) for figures kept
+    elsewhere (breaker state, cache hits).
+    """
+    lines = [
+        "# HELP upstream_request_duration_seconds Duration of upstream HTTP calls.",
+        "# TYPE upstream_request_duration_seconds histogram",
+    ]
+    sizes = []
+    for (upstream, method, endpoint, status), row in sorted(snapshot().items()):
+        base = dict(const_labels, upstream=upstream, method=method,
+                    endpoint=endpoint, status=status)
+        cumulative = 0
+        for bound, n in zip(BUCKETS + ("+Inf",), row):
+            cumulative += n
+            lines.append(
+                f"upstream_request_duration_seconds_bucket{_labels(**base, le=bound)} {cumulative}"
+            )
+        lines.append(f"upstream_request_duration_seconds_sum{_labels(**base)} {row[-3]:.6f}")
+        lines.append(f"upstream_request_duration_seconds_count{_labels(**base)} {row[-2]}")
+        sizes.append(f"upstream_response_bytes_total{_labels(**base)} {row[-1]}")
+
+    lines.append("# HELP upstream_response_bytes_total Bytes received from upstreams.")
+    lines.append("# TYPE upstream_response_bytes_total counter")
+    lines.extend(sizes)
+
+    for name, help_text, kind, samples in gauges:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(**const_labels, **labels)} {value}")
+    return "\n".join(lines) + "\n"
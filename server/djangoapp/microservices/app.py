@@ -1,10 +1,31 @@
-from flask import Flask
+import os
+
+from flask import Flask, request
 from nltk.sentiment import SentimentIntensityAnalyzer
 import json
 app = Flask("Sentiment Analyzer")
 
+# Built at import: under gunicorn (gunicorn.conf.py, preload_app) that is
+# once in the master, and the forked workers share the lexicon.
 sia = SentimentIntensityAnalyzer()
 
+MAX_BATCH = 1000
+
+# Scored by /readyz to prove the analyzer works, not just the process.
+READY_PROBE = "good"
+
+
+def label(text):
+    scores = sia.polarity_scores(text)
+    pos = float(scores['pos'])
+    neg = float(scores['neg'])
+    neu = float(scores['neu'])
+    if (neg > pos and neg > neu):
+        return "negative"
+    elif (neu > neg and neu > pos):
+        return "neutral"
+    return "positive"
+
 
 @app.get('/')
 def home():
@@ -12,24 +33,60 @@ def home():
     Use /analyze/text to get the sentiment"
 
 
+@app.get('/healthz')
+def healthz():
+    """Liveness: the worker is up and serving requests."""
+    return {"status": "ok", "pid": os.getpid()}
+
+
+@app.get('/readyz')
+def readyz():
+    """Readiness: the lexicon is loaded and scoring works."""
+    try:
+        ok = label(READY_PROBE) == "positive"
+    except Exception as e:
+        return {"status": "error", "detail": str(e)}, 503
+    if not ok:
+        return {"status": "error", "detail": "unexpected probe result"}, 503
+    return {"status": "ready", "lexicon": len(sia.lexicon)}
+
+
 @app.get('/analyze/<input_txt>')
 def analyze_sentiment(input_txt):
+    return json.dumps({"sentiment": label(input_txt)})
 
-    scores = sia.polarity_scores(input_txt)
-    print(scores)
-    pos = float(scores['pos'])
-    neg = float(scores['neg'])
-    neu = float(scores['neu'])
-    res = "positive"
-    print("pos neg nue ", pos, neg, neu)
-    if (neg > pos and neg > neu):
-        res = "negative"
-    elif (neu > neg and neu > pos):
-        res = "neutral"
-    res = json.dumps({"sentiment": res})
-    print(res)
-    return res
+
+@app.post('/analyze/batch')
+def analyze_batch():
+    """
+    Body: {"items": [{"id": ..., "text": "..."}, ...]} (or the bare list).
+    Returns: {"results": [{"id": ..., "sentiment": "..."}, ...]} in order.
+    """
+    payload = request.get_json(silent=True)
+    items = payload.get("items") if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        return {"error": "expected a JSON list of items"}, 400
+    if len(items) > MAX_BATCH:
+        return {"error": f"at most {MAX_BATCH} items per batch"}, 413
+
+    results = []
+    for i, item in enumerate(items):
+        if isinstance(item, dict):
+            item_id, text = item.get("id", i), item.get("text")
+        else:
+            item_id, text = i, item
+        text = str(text or "").strip()
+        results.append({
+            "id": item_id,
+            "sentiment": label(text) if text else "neutral",
+        })
+    return {"results": results}
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Development only; production runs gunicorn -c gunicorn.conf.py app:app
+    app.run(
+        host=os.environ.get("HOST", "127.0.0.1"),
+        port=int(os.environ.get("PORT", "5000")),
+        debug=os.environ.get("FLASK_DEBUG", "0") in ("1", "true", "yes"),
+    )
@@ -0,0 +1,43 @@
+# gunicorn settings for the sentiment analyzer:  gunicorn -c gunicorn.conf.py app:app
+#
+# Scoring is CPU-bound, so concurrency comes from pre-forked worker
+# processes (about one per core) rather than threads. preload_app imports
+# app.py, and with it the VADER lexicon, once in the master before
+# forking, so workers share those pages copy-on-write instead of each
+# loading its own copy.
+import gc
+import multiprocessing
+import os
+
+
+def _int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+workers = max(1, _int("ANALYZER_WORKERS", multiprocessing.cpu_count()))
+# A couple of threads per worker overlap socket I/O with scoring.
+threads = max(1, _int("ANALYZER_THREADS", 2))
+preload_app = True
+
+# Workers stuck longer than this are killed and replaced.
+timeout = _int("ANALYZER_TIMEOUT", 30)
+graceful_timeout = _int("ANALYZER_GRACEFUL_TIMEOUT", 30)
+keepalive = _int("ANALYZER_KEEPALIVE", 5)
+# Recycle workers now and then; jitter keeps them from restarting together.
+max_requests = _int("ANALYZER_MAX_REQUESTS", 10000)
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get("ANALYZER_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.environ.get("ANALYZER_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    # Move everything loaded so far (the lexicon dict) out of the GC's
+    # reach, so collections in the workers do not write to those pages
+    # and undo the copy-on-write sharing.
+    gc.freeze()
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='carmodel',
+            name='type',
+            field=models.CharField(choices=[('SEDAN', 'Sedan'), ('SUV', 'SUV'), ('WAGON', 'Wagon'), ('HATCHBACK', 'Hatchback'), ('COUPE', 'Coupe'), ('CONVERTIBLE', 'Convertible'), ('MINIVAN', 'Minivan'), ('PICKUP', 'Pickup')], default='SUV', max_length=12),
+        ),
+    ]
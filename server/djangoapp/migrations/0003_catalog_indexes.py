@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0002_carmodel_body_types'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carmake',
+            index=models.Index(fields=['name'], name='carmake_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(fields=['car_make', 'type', 'year'], name='carmodel_make_type_year'),
+        ),
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(fields=['type', 'year'], name='carmodel_type_year'),
+        ),
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(fields=['dealer_id', 'year'], name='carmodel_dealer_year'),
+        ),
+    ]
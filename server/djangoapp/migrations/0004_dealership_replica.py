@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0003_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Dealership',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('full_name', models.CharField(blank=True, max_length=200)),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('state', models.CharField(blank=True, max_length=64)),
+                ('state_key', models.CharField(blank=True, max_length=64)),
+                ('st', models.CharField(blank=True, max_length=8)),
+                ('zip', models.CharField(blank=True, max_length=16)),
+                ('lat', models.FloatField(null=True)),
+                ('lon', models.FloatField(null=True)),
+                ('doc', models.TextField()),
+                ('synced_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['state_key'], name='dealership_state_key'), models.Index(fields=['zip'], name='dealership_zip'), models.Index(fields=['synced_at'], name='dealership_synced_at')],
+            },
+        ),
+    ]
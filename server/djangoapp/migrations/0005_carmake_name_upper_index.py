@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:19
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0004_dealership_replica'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='carmake',
+            name='carmake_name_idx',
+        ),
+        migrations.AddIndex(
+            model_name='carmake',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='carmake_name_upper_idx'),
+        ),
+    ]
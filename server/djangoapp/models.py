@@ -1,6 +1,7 @@
 # Uncomment the following imports before adding the Model code
 
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.timezone import now
 from django.core.validators import MaxValueValidator, MinValueValidator
 
@@ -14,6 +15,10 @@ class CarMake(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField()
 
+    class Meta:
+        # get_cars matches ?make= on UPPER(name) (djangoapp/catalog.py).
+        indexes = [models.Index(Upper("name"), name="carmake_name_upper_idx")]
+
     def __str__(self):
         return self.name
 
@@ -27,8 +32,13 @@ class CarModel(models.Model):
         ('SEDAN', 'Sedan'),
         ('SUV', 'SUV'),
         ('WAGON', 'Wagon'),
+        ('HATCHBACK', 'Hatchback'),
+        ('COUPE', 'Coupe'),
+        ('CONVERTIBLE', 'Convertible'),
+        ('MINIVAN', 'Minivan'),
+        ('PICKUP', 'Pickup'),
     ]
-    type = models.CharField(max_length=10, choices=CAR_TYPES, default='SUV')
+    type = models.CharField(max_length=12, choices=CAR_TYPES, default='SUV')
 
     # Use a reasonable bound; adjust if you like
     year = models.IntegerField(
@@ -38,5 +48,43 @@ class CarModel(models.Model):
 
     dealer_id = models.IntegerField(default=0)  # optional, aligns with lab text
 
+    class Meta:
+        # Cover the get_cars filters: make (+type, +year), type+year, dealer+year.
+        indexes = [
+            models.Index(fields=["car_make", "type", "year"], name="carmodel_make_type_year"),
+            models.Index(fields=["type", "year"], name="carmodel_type_year"),
+            models.Index(fields=["dealer_id", "year"], name="carmodel_dealer_year"),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.car_make.name})"
+
+
+class Dealership(models.Model):
+    """
+    Local replica of the Node backend's dealerships, written by
+    `manage.py sync_dealers` and read through djangoapp/dealer_replica.py.
+    `doc` is the backend's JSON for the dealer, served as is; the other
+    columns are copies of its fields for lookups.
+    """
+    id = models.IntegerField(primary_key=True)  # the backend's id
+    full_name = models.CharField(max_length=200, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=64, blank=True)
+    state_key = models.CharField(max_length=64, blank=True)  # state.lower()
+    st = models.CharField(max_length=8, blank=True)
+    zip = models.CharField(max_length=16, blank=True)
+    lat = models.FloatField(null=True)
+    lon = models.FloatField(null=True)
+    doc = models.TextField()
+    synced_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["state_key"], name="dealership_state_key"),
+            models.Index(fields=["zip"], name="dealership_zip"),
+            models.Index(fields=["synced_at"], name="dealership_synced_at"),
+        ]
+
+    def __str__(self):
+        return self.full_name or f"Dealer {self.id}"
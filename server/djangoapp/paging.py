@@ -0,0 +1,107 @@
+# server/djangoapp/paging.py
+"""
+limit/cursor pagination and fields= projection for the list endpoints.
+
+Items are ordered by their numeric "id"; the cursor is the last id of the
+previous page, so pages stay stable while new items are appended. The
+same params are forwarded to the Node backend (asking for one extra item
+to learn whether another page exists), and everything is re-applied here
+so an older backend that ignores them still gets paged correctly.
+"""
+
+MAX_LIMIT = 500
+
+
+def parse_page(request):
+    """
+    {"limit", "cursor", "fields"} from the query string, or None when the
+    client asked for neither paging nor projection. Raises ValueError.
+    """
+    limit = request.GET.get("limit")
+    cursor = request.GET.get("cursor")
+    fields = request.GET.get("fields")
+    if limit is None and cursor is None and fields is None:
+        return None
+
+    page = {"limit": None, "cursor": None, "fields": None}
+    if limit not in (None, ""):
+        try:
+            page["limit"] = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if not 1 <= page["limit"] <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    if cursor not in (None, ""):
+        try:
+            page["cursor"] = int(cursor)
+        except ValueError:
+            raise ValueError("invalid cursor")
+    if fields:
+        page["fields"] = sorted({f.strip() for f in fields.split(",") if f.strip()})
+    return page
+
+
+def page_key(page) -> str:
+    """Stable cache-key fragment for a page request ("" when unpaged)."""
+    if not page:
+        return ""
+    return "limit={}&cursor={}&fields={}".format(
+        page["limit"] or "", page["cursor"] or "", ",".join(page["fields"] or ())
+    )
+
+
+def backend_params(page, required=("id",)):
+    """Query params for the Node backend; `required` fields are always fetched."""
+    if not page:
+        return {}
+    params = {}
+    if page["limit"]:
+        params["limit"] = page["limit"] + 1
+    if page["cursor"] is not None:
+        params["cursor"] = page["cursor"]
+    if page["fields"]:
+        params["fields"] = ",".join(sorted(set(page["fields"]) | set(required)))
+    return params
+
+
+def _id(item):
+    try:
+        return int(item.get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _after(ordered, cursor):
+    # First index with id > cursor in an id-ordered list.
+    lo, hi = 0, len(ordered)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _id(ordered[mid]) <= cursor:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def paginate(items, page, ordered=False):
+    """(items of this page, next cursor or None). `ordered`: items are already in id order."""
+    if not page or (page["limit"] is None and page["cursor"] is None):
+        return list(items), None
+    if not ordered:
+        items = sorted(items, key=_id)
+    start = _after(items, page["cursor"]) if page["cursor"] is not None else 0
+    if page["limit"] is None:
+        return items[start:], None
+    # One past the limit tells whether there is a next page.
+    window = items[start:start + page["limit"] + 1]
+    if len(window) <= page["limit"]:
+        return window, None
+    window = window[:page["limit"]]
+    return window, str(_id(window[-1]))
+
+
+def project(items, fields):
+    """Keep only `fields` of each item (all of them when fields is None)."""
+    if not fields:
+        return items
+    return [{f: it[f] for f in fields if f in it} for it in items]
@@ -1,5 +1,13 @@
+import json
+
+from django.db import transaction
+
+from .catalog import bump_catalog_version
 from .models import CarMake, CarModel
 
+BATCH_SIZE = 2000
+_CAR_TYPES = {key for key, _ in CarModel.CAR_TYPES}
+
 def initiate():
     # If already seeded, do nothing
     if CarModel.objects.exists():
@@ -14,14 +22,6 @@ def initiate():
         {"name": "Toyota",   "description": "Great cars. Japanese technology"},
     ]
 
-    makes_by_name = {}
-    for d in car_make_data:
-        make, _ = CarMake.objects.get_or_create(
-            name=d["name"],
-            defaults={"description": d["description"]}
-        )
-        makes_by_name[d["name"]] = make
-
     # --- Car models ---
     car_model_data = [
         {"name": "Pathfinder", "type": "SUV",   "year": 2023, "make": "NISSAN"},
@@ -45,9 +45,144 @@ def initiate():
         {"name": "Kluger",     "type": "SUV",   "year": 2023, "make": "Toyota"},
     ]
 
-    for d in car_model_data:
-        CarModel.objects.get_or_create(
-            name=d["name"],
-            car_make=makes_by_name[d["make"]],
-            defaults={"type": d["type"], "year": d["year"]}
-        )
+    rows = (
+        {"make": d["make"], "model": d["name"], "bodyType": d["type"], "year": d["year"]}
+        for d in car_model_data
+    )
+    load_cars(rows, makes=car_make_data)
+
+
+def _car_type(body_type) -> str:
+    t = str(body_type or "").strip().upper()
+    return t if t in _CAR_TYPES else CarModel._meta.get_field("type").default
+
+
+def load_cars(rows, makes=(), batch_size=BATCH_SIZE, replace=False):
+    """
+    Bulk-load car models in one transaction. `rows` is any iterable of
+    {"make", "model", "bodyType", "year", "dealer_id"} dicts (the shape of
+    database/data/car_records.json) and is consumed lazily, so memory stays
+    flat however long it is. Unknown makes are created on first sight;
+    `makes` can pre-seed them with descriptions. Returns the models created.
+    """
+    created = 0
+    with transaction.atomic():
+        if replace:
+            CarModel.objects.all().delete()
+
+        # Makes are matched case-insensitively ("Nissan" == "NISSAN").
+        make_ids = {name.lower(): pk for pk, name in CarMake.objects.values_list("id", "name")}
+        new_makes = [
+            CarMake(name=m["name"], description=m.get("description", ""))
+            for m in makes if m["name"].lower() not in make_ids
+        ]
+        CarMake.objects.bulk_create(new_makes)
+        # Re-read rather than trust bulk_create PKs (MySQL doesn't set them).
+        make_ids = {name.lower(): pk for pk, name in CarMake.objects.values_list("id", "name")}
+
+        batch = []
+        for row in rows:
+            make_name = str(row.get("make") or "").strip()
+            model_name = str(row.get("model") or "").strip()
+            if not make_name or not model_name:
+                continue
+            make_id = make_ids.get(make_name.lower())
+            if make_id is None:
+                make_id = make_ids[make_name.lower()] = CarMake.objects.create(
+                    name=make_name, description=""
+                ).pk
+            batch.append(CarModel(
+                car_make_id=make_id,
+                name=model_name,
+                type=_car_type(row.get("bodyType") or row.get("type")),
+                year=int(row.get("year") or 2023),
+                dealer_id=int(row.get("dealer_id") or 0),
+            ))
+            if len(batch) >= batch_size:
+                CarModel.objects.bulk_create(batch, batch_size=batch_size)
+                created += len(batch)
+                batch = []
+        if batch:
+            CarModel.objects.bulk_create(batch, batch_size=batch_size)
+            created += len(batch)
+    # bulk_create sends no post_save, so retire cached catalog queries here.
+    bump_catalog_version()
+    return created
+
+
+def iter_json_array(fp, key=None, chunk_size=1 << 16):
+    """
+    Yield the items of a JSON array one at a time without loading the
+    whole document: either a top-level array, or the array under `key`
+    in a top-level object (e.g. key="cars" for car_records.json). The
+    object's other members are decoded and skipped, so a nested "cars"
+    or a string equal to the key is never taken for it.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        # Read on, dropping what has been consumed.
+        nonlocal buf, pos, eof
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buf, pos = buf[pos:] + chunk, 0
+
+    def peek(skip=" \t\r\n"):
+        # The next character not in `skip` ("" at the end of the input).
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in skip:
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            fill()
+
+    def decode():
+        # The value starting at pos, read on until it is complete. A number cut by
+        # the chunk boundary ("12" of "1234", "4" of "4.5") decodes fine,
+        # so it is only taken once something follows it.
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if not eof and (end == len(buf) or buf[end] in ".eE+-"):
+                fill()
+                continue
+            pos = end
+            return value
+
+    def expect(char, what):
+        nonlocal pos
+        if peek() != char:
+            raise ValueError(f"no JSON {what} found")
+        pos += 1
+
+    if key is None:
+        expect("[", "array")
+    else:
+        expect("{", "object")
+        while True:
+            # Top-level members only: a name, ":", then its value.
+            if peek(" \t\r\n,") != '"':
+                raise ValueError(f"no JSON array for {key!r} found")
+            name = decode()
+            expect(":", "value")
+            if name == key:
+                expect("[", f"array for {key!r}")
+                break
+            peek()
+            decode()
+
+    while True:
+        char = peek(" \t\r\n,")
+        if char == "]":
+            return
+        if not char:
+            raise ValueError("unterminated JSON array")
+        yield decode()
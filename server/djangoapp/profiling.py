@@ -0,0 +1,145 @@
+# server/djangoapp/profiling.py
+"""
+Opt-in per-request profiling.
+
+ProfilingMiddleware profiles a request when it carries the
+settings.PROFILE_HEADER header (default "X-Profile: 1") or is picked by
+settings.PROFILE_SAMPLE_RATE. For a profiled request it reports
+
+    total                  the whole request, middleware included
+    db                     ORM query time and count
+    backend / sentiment    time in restapis upstream calls, per upstream
+    json                   JSON serialization (codec.JsonResponse)
+
+as a Server-Timing header, and logs one "djangoapp.profiling" record
+for sampled requests. Upstream time is summed over calls, so a parallel
+fan-out can add up to more than `total`.
+
+Requests that are not profiled pay one context-variable lookup per
+query, upstream call and JsonResponse.
+"""
+
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# (name, seconds) pairs for the request being profiled, or None. The list
+# is shared with threads and tasks that copy the context, and
+# list.append is atomic, so they can record into it without a lock.
+_current = ContextVar("djangoapp_profile", default=None)
+
+
+def add(name: str, seconds: float):
+    """Record `seconds` under `name` if the current request is profiled."""
+    prof = _current.get()
+    if prof is not None:
+        prof.append((name, seconds))
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    prof = _current.get()
+    if prof is None:
+        return execute(sql, params, many, context)
+    t0 = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        prof.append(("db", time.perf_counter() - t0))
+
+
+def _install_db_wrapper(sender, connection, **kwargs):
+    # Installed on every connection once, in whichever thread opens it,
+    # so queries run under sync_to_async are seen too.
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+connection_created.connect(_install_db_wrapper, dispatch_uid="djangoapp_profiling_db")
+
+
+def _summary(records) -> dict:
+    totals = {}
+    for name, seconds in records:
+        row = totals.setdefault(name, [0.0, 0])
+        row[0] += seconds
+        row[1] += 1
+    return totals
+
+
+def _server_timing(total, totals) -> str:
+    parts = [f"total;dur={total * 1000:.1f}"]
+    for name, (seconds, count) in sorted(totals.items()):
+        noun = ("query", "queries") if name == "db" else ("call", "calls")
+        parts.append(f'{name};dur={seconds * 1000:.1f};desc="{count} {noun[count != 1]}"')
+    return ", ".join(parts)
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rate = float(getattr(settings, "PROFILE_SAMPLE_RATE", 0.0))
+        header = getattr(settings, "PROFILE_HEADER", "X-Profile")
+        self.header = header or None
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _wanted(self, request):
+        """None, or whether the request was sampled (vs asked for)."""
+        if self.rate and random.random() < self.rate:
+            return True
+        if self.header and request.headers.get(self.header) in ("1", "true", "yes"):
+            return False
+        return None
+
+    def _finish(self, request, response, records, t0, sampled):
+        total = time.perf_counter() - t0
+        totals = _summary(records)
+        response["Server-Timing"] = _server_timing(total, totals)
+        if sampled and logger.isEnabledFor(logging.INFO):
+            fields = " ".join(
+                f"{name}_ms={seconds * 1000:.1f} {name}_n={count}"
+                for name, (seconds, count) in sorted(totals.items())
+            )
+            logger.info(
+                "method=%s path=%s status=%s total_ms=%.1f %s",
+                request.method, request.path, response.status_code, total * 1000, fields,
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        sampled = self._wanted(request)
+        if sampled is None:
+            return self.get_response(request)
+        records = []
+        token = _current.set(records)
+        t0 = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, records, t0, sampled)
+
+    async def __acall__(self, request):
+        sampled = self._wanted(request)
+        if sampled is None:
+            return await self.get_response(request)
+        records = []
+        token = _current.set(records)
+        t0 = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, records, t0, sampled)
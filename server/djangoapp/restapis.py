@@ -1,9 +1,22 @@
 # server/djangoapp/restapis.py
+import asyncio
+import contextvars
+import hashlib
+import logging
 import os
+import threading
+import time
+import weakref
 import requests
-from urllib.parse import urlencode, quote_plus
+from asgiref.sync import sync_to_async
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlencode, quote
 from pathlib import Path
 
+from . import codec, metrics, profiling, singleflight
+
 # Load .env as a fallback only (do NOT override real env provided by K8s)
 try:
     from dotenv import load_dotenv
@@ -14,60 +27,771 @@ except Exception:
 def _env(name: str, default: str = "") -> str:
     return os.environ.get(name, default).strip()
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(_env(name, str(default)))
+    except ValueError:
+        return default
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(_env(name, str(default)))
+    except ValueError:
+        return default
+
 def _norm_base(url: str) -> str:
     return (url or "").rstrip("/")
 
 BACKEND_URL = _norm_base(_env("BACKEND_URL", "http://localhost:3030"))
 SENT_BASE   = _norm_base(_env("sentiment_analyzer_url"))
 
+# "remote" calls the analyzer microservice; "local" scores in this process
+# with djangoapp.sentiment (same VADER labels, needs nltk, no HTTP hop).
+# SENTIMENT_PROCESSES > 1 lets the local engine use a process pool.
+SENTIMENT_ENGINE    = _env("SENTIMENT_ENGINE", "remote").lower()
+SENTIMENT_PROCESSES = max(1, _env_int("SENTIMENT_PROCESSES", 1))
+
 if not BACKEND_URL:
     raise RuntimeError("backend_url is not set (env or .env)")
-if not SENT_BASE:
+if not SENT_BASE and SENTIMENT_ENGINE != "local":
     raise RuntimeError("sentiment_analyzer_url is not set (env or .env)")
 
-print(f"[restapis] BACKEND_URL = {BACKEND_URL}")
-print(f"[restapis] SENT_URL    = {SENT_BASE}")
+# Per-call lines (upstream, endpoint template, status, duration, bytes) are
+# logged at DEBUG, so they cost nothing unless that level is switched on;
+# failures are WARNINGs. Configure via settings.LOGGING.
+logger = logging.getLogger(__name__)
+
+logger.info("BACKEND_URL = %s", BACKEND_URL)
+logger.info("SENT_URL    = %s (engine: %s)", SENT_BASE or "-", SENTIMENT_ENGINE)
+
+# Fan-out of per-review sentiment calls. SENTIMENT_WORKERS=1 scores one
+# review at a time; SENTIMENT_DEADLINE bounds the whole fan-out either way.
+SENTIMENT_WORKERS  = max(1, _env_int("SENTIMENT_WORKERS", 8))
+SENTIMENT_DEADLINE = _env_float("SENTIMENT_DEADLINE", 3.0)
+
+# POST /analyze/batch scores a whole dealer page in one request. Switched off
+# for the process the first time the analyzer answers 404/405 (older image).
+SENTIMENT_BATCH = _env("SENTIMENT_BATCH", "1") not in ("0", "false", "no")
+# The analyzer refuses batches over its MAX_BATCH (1000) with a 413; bigger
+# pages go out as several batches of at most this many, side by side.
+SENTIMENT_BATCH_SIZE = max(1, _env_int("SENTIMENT_BATCH_SIZE", 1000))
+
+# Pooled keep-alive sessions, one per upstream. Connect and read timeouts
+# are separate; only idempotent GETs are retried (with backoff) on
+# connection errors and 502/503/504.
+BACKEND_POOL_SIZE   = max(1, _env_int("BACKEND_POOL_SIZE", 10))
+SENTIMENT_POOL_SIZE = max(1, _env_int("SENTIMENT_POOL_SIZE", SENTIMENT_WORKERS))
+CONNECT_TIMEOUT     = _env_float("UPSTREAM_CONNECT_TIMEOUT", 3.05)
+READ_TIMEOUT        = _env_float("UPSTREAM_READ_TIMEOUT", 10.0)
+GET_RETRIES         = max(0, _env_int("UPSTREAM_GET_RETRIES", 2))
+RETRY_BACKOFF       = _env_float("UPSTREAM_RETRY_BACKOFF", 0.2)
+KEEPALIVE           = _env("UPSTREAM_KEEPALIVE", "1") not in ("0", "false", "no")
+
+# Circuit breaker on the analyzer: after SENTIMENT_BREAKER_FAILURES failures
+# in a row (errors, timeouts, 5xx) sentiment calls return the fallback
+# without touching the network; after SENTIMENT_BREAKER_RESET seconds one
+# probe call is let through to see if it recovered. 0 failures disables it.
+SENTIMENT_BREAKER_FAILURES = max(0, _env_int("SENTIMENT_BREAKER_FAILURES", 5))
+SENTIMENT_BREAKER_RESET    = _env_float("SENTIMENT_BREAKER_RESET", 30.0)
+
+# Single-flight: concurrent identical idempotent calls (backend GETs,
+# analyzer GETs/batches) share one upstream call per process. With
+# SINGLE_FLIGHT_SHARED=1 the sync path also coalesces across the workers
+# on a host through file locks (djangoapp/singleflight.py).
+SINGLE_FLIGHT        = _env("SINGLE_FLIGHT", "1") not in ("0", "false", "no")
+SINGLE_FLIGHT_SHARED = _env("SINGLE_FLIGHT_SHARED", "0") not in ("0", "false", "no")
+
+NEUTRAL = {"sentiment": "neutral"}
+# Stand-in when the analyzer could not score a text; never cached.
+FALLBACK = {"sentiment": "neutral", "fallback": True}
 
 def _join(base: str, endpoint: str) -> str:
     ep = endpoint if endpoint.startswith("/") else f"/{endpoint}"
     return f"{base}{ep}"
 
-def get_request(endpoint: str, **params):
-    """GET the Node/Mongo backend."""
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _new_session(pool_size: int) -> requests.Session:
+    retry = Retry(
+        total=GET_RETRIES,
+        connect=GET_RETRIES,
+        read=GET_RETRIES,
+        status=GET_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+    )
+    s = requests.Session()
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    if not KEEPALIVE:
+        s.headers["Connection"] = "close"
+    return s
+
+def _session(upstream: str) -> requests.Session:
+    """Shared session for "backend" or "sentiment", recreated after fork."""
+    key = (upstream, os.getpid())
+    s = _sessions.get(key)
+    if s is None:
+        with _sessions_lock:
+            s = _sessions.get(key)
+            if s is None:
+                size = BACKEND_POOL_SIZE if upstream == "backend" else SENTIMENT_POOL_SIZE
+                s = _sessions[key] = _new_session(size)
+    return s
+
+def _timeout(read: float = None):
+    read = READ_TIMEOUT if read is None else read
+    return (min(CONNECT_TIMEOUT, read), read)
+
+def _body(r):
+    """Decoded JSON, or text for non-JSON replies (requests or httpx)."""
+    ct = (r.headers.get("content-type") or "").lower()
+    return codec.loads(r.content) if "application/json" in ct else r.text
+
+def _raw_body(r):
+    """The undecoded bytes of a JSON reply; None for anything else."""
+    ct = (r.headers.get("content-type") or "").lower()
+    body = r.content
+    if "application/json" not in ct or not body.strip():
+        return None
+    return body
+
+class CircuitBreaker:
+    """
+    closed -> open after `failures` consecutive failures; open -> half-open
+    once `reset` seconds have passed, letting one probe call through;
+    the probe's outcome closes or re-opens it. A probe that never reports
+    back (cancelled at a deadline) is replaced after another `reset`.
+    """
+
+    def __init__(self, name: str, failures: int, reset: float):
+        self.name = name
+        self.failures = failures
+        self.reset = reset
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.consecutive = 0
+        self.trips = 0
+        self.short_circuits = 0
+        self.opened_at = None
+        self._probe_at = None
+
+    def allow(self) -> bool:
+        if not self.failures:
+            return True
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if self.state == "open" and now - self.opened_at >= self.reset:
+                self.state = "half-open"
+                logger.info("%s breaker half-open; probing", self.name)
+            if self.state == "half-open" and (
+                self._probe_at is None or now - self._probe_at >= self.reset
+            ):
+                self._probe_at = now
+                return True
+            self.short_circuits += 1
+            return False
+
+    def success(self):
+        with self._lock:
+            if self.state != "closed":
+                logger.info("%s breaker closed", self.name)
+            self.state = "closed"
+            self.consecutive = 0
+            self._probe_at = None
+
+    def failure(self):
+        if not self.failures:
+            return
+        with self._lock:
+            self.consecutive += 1
+            if self.state == "half-open" or (
+                self.state == "closed" and self.consecutive >= self.failures
+            ):
+                self.state = "open"
+                self.trips += 1
+                self.opened_at = time.monotonic()
+                self._probe_at = None
+                logger.warning("%s breaker open (%d failures, trip %d)",
+                               self.name, self.consecutive, self.trips)
+
+    def record(self, status_code: int):
+        """Outcome of a call that got an HTTP answer; 4xx means it is up."""
+        if status_code >= 500:
+            self.failure()
+        else:
+            self.success()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive,
+                "trips": self.trips,
+                "short_circuits": self.short_circuits,
+                "open_for": (
+                    round(time.monotonic() - self.opened_at, 3)
+                    if self.state != "closed" else 0.0
+                ),
+            }
+
+_sentiment_breaker = CircuitBreaker(
+    "sentiment", SENTIMENT_BREAKER_FAILURES, SENTIMENT_BREAKER_RESET
+)
+
+def sentiment_breaker_stats() -> dict:
+    return _sentiment_breaker.stats()
+
+def single_flight_stats() -> dict:
+    return singleflight.stats()
+
+def _describe(e) -> str:
+    """Short error text without the URL (it can carry review text)."""
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return f"HTTP {status}" if status else type(e).__name__
+
+def _observe(upstream, method, endpoint, status, t0, nbytes=0):
+    seconds = time.perf_counter() - t0
+    template = metrics.endpoint_template(endpoint)
+    metrics.observe(upstream, method, template, status, seconds, nbytes)
+    profiling.add(upstream, seconds)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "upstream=%s method=%s endpoint=%s status=%s duration_ms=%.1f bytes=%d",
+            upstream, method, template, status, seconds * 1000, nbytes,
+        )
+
+def _settle(upstream, status):
+    # Once per real call (not per single-flight waiter) so a burst of
+    # waiters on one failed call counts as one breaker failure.
+    if upstream == "sentiment":
+        if status is None:
+            _sentiment_breaker.failure()
+        else:
+            _sentiment_breaker.record(status)
+
+def _flight_key(upstream, method, url, kwargs):
+    body = kwargs.get("json")
+    digest = "" if body is None else hashlib.sha1(
+        codec.dumps(body, sort_keys=True)
+    ).hexdigest()
+    return (upstream, method, url, digest)
+
+def _json_body(kwargs, field):
+    """A `json=` body pre-encoded with codec, passed as `field` (data/content)."""
+    if kwargs.get("json") is None:
+        return kwargs
+    kwargs = dict(kwargs)
+    kwargs[field] = codec.dumps(kwargs.pop("json"))
+    kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+    return kwargs
+
+def _call_once(upstream, method, endpoint, url, **kwargs):
+    kwargs = _json_body(kwargs, "data")
+    t0 = time.perf_counter()
+    try:
+        r = _session(upstream).request(method, url, **kwargs)
+    except Exception:
+        _observe(upstream, method, endpoint, "error", t0)
+        _settle(upstream, None)
+        raise
+    _observe(upstream, method, endpoint, r.status_code, t0, len(r.content))
+    _settle(upstream, r.status_code)
+    return r
+
+def _encode_response(r):
+    return {"status": r.status_code, "content_type": r.headers.get("content-type", "")}, r.content
+
+def _decode_response(header, body):
+    r = requests.Response()
+    r.status_code = header["status"]
+    r.headers["Content-Type"] = header["content_type"]
+    r.encoding = requests.utils.get_encoding_from_headers(r.headers) or "utf-8"
+    r._content = body
+    return r
+
+def _call(upstream: str, method: str, endpoint: str, url: str, coalesce=False, **kwargs):
+    """
+    One instrumented request on the upstream's pooled session.
+    coalesce=True (idempotent calls only) lets concurrent identical calls
+    share it; callers get the same Response and decode it themselves.
+    """
+    if not (coalesce and SINGLE_FLIGHT):
+        return _call_once(upstream, method, endpoint, url, **kwargs)
+
+    key = _flight_key(upstream, method, url, kwargs)
+
+    def fetch():
+        return _call_once(upstream, method, endpoint, url, **kwargs)
+
+    if SINGLE_FLIGHT_SHARED:
+        wait_for = (kwargs.get("timeout") or _timeout())[1]
+        return singleflight.do(key, lambda: singleflight.shared(
+            key, fetch, _encode_response, _decode_response, wait_for
+        ))
+    return singleflight.do(key, fetch)
+
+def _get(endpoint, params, decode):
     url = _join(BACKEND_URL, endpoint)
     if params:
         url = f"{url}?{urlencode(params)}"
-    print(f"[restapis] GET {url}")
     try:
-        r = requests.get(url, timeout=10)
+        r = _call("backend", "GET", endpoint, url, coalesce=True, timeout=_timeout())
         r.raise_for_status()
-        ct = (r.headers.get("content-type") or "").lower()
-        return r.json() if "application/json" in ct else r.text
+        return decode(r)
     except Exception as e:
-        print("[restapis] GET error:", e)
+        logger.warning("backend GET %s failed: %s",
+                       metrics.endpoint_template(endpoint), _describe(e))
         return None
 
-def analyze_review_sentiments(text: str):
+def get_request(endpoint: str, **params):
+    """GET the Node/Mongo backend."""
+    return _get(endpoint, params, _body)
+
+def get_request_raw(endpoint: str, **params):
+    """
+    get_request without decoding: the JSON body as bytes, for views that
+    pass it through unchanged. None on failure or a non-JSON reply.
+    """
+    return _get(endpoint, params, _raw_body)
+
+def _analyze_path(text):
+    # Percent-encode everything, spaces included: Flask does not turn "+"
+    # back into a space in a path segment, so quote_plus would hand the
+    # analyzer one long token.
+    return f"analyze/{quote(text or '', safe='')}"
+
+def analyze_review_sentiments(text: str, timeout: float = None):
     """GET the sentiment analyzer microservice."""
-    url = _join(SENT_BASE, f"analyze/{quote_plus(text or '')}")
-    print(f"[restapis] SENT {url}")
+    if not _sentiment_breaker.allow():
+        return dict(FALLBACK)
+    url = _join(SENT_BASE, _analyze_path(text))
+    try:
+        r = _call("sentiment", "GET", "/analyze/:text", url, coalesce=True,
+                  timeout=_timeout(timeout))
+        r.raise_for_status()
+        return codec.loads(r.content)
+    except Exception as e:
+        logger.warning("sentiment GET failed: %s", _describe(e))
+        return dict(FALLBACK)
+
+_executor = None
+
+def _sentiment_executor() -> ThreadPoolExecutor:
+    # Created lazily so each gunicorn worker gets its own pool after fork.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=SENTIMENT_WORKERS, thread_name_prefix="sentiment"
+        )
+    return _executor
+
+def analyze_review_sentiments_many(texts, deadline: float = None):
+    """
+    Score many texts concurrently. Results keep the order of `texts`.
+    Empty texts and anything not finished within `deadline` seconds
+    come back as neutral instead of holding up the response.
+    """
+    texts = [(t or "").strip() for t in texts]
+    deadline = SENTIMENT_DEADLINE if deadline is None else deadline
+    results = [dict(FALLBACK) if t else dict(NEUTRAL) for t in texts]
+    todo = [i for i, t in enumerate(texts) if t]
+    if not todo:
+        return results
+
+    pool = _sentiment_executor()
+    # Each call runs in a copy of this context so a request profile sees it.
+    futures = {
+        pool.submit(
+            contextvars.copy_context().run, analyze_review_sentiments, texts[i], deadline
+        ): i
+        for i in todo
+    }
+    done, pending = wait(futures, timeout=deadline)
+    for f in pending:
+        f.cancel()
+    if pending:
+        logger.warning("sentiment deadline hit: %d/%d neutral", len(pending), len(todo))
+    for f in done:
+        try:
+            results[futures[f]] = f.result() or dict(FALLBACK)
+        except Exception:
+            pass
+    return results
+
+def analyze_review_sentiments_batch(texts, timeout: float = None):
+    """
+    POST the texts to the analyzer's batch endpoint, in chunks of at most
+    SENTIMENT_BATCH_SIZE sent concurrently. Returns results in the order
+    of `texts`, or None if a batch call is unavailable/failed so the
+    caller can fall back to the fan-out.
+    """
+    results, items = _batch_items(texts)
+    if not items:
+        return results
+    if not SENTIMENT_BATCH:
+        return None
+    if not _sentiment_breaker.allow():
+        return results  # all fallback; no point trying the fan-out either
+
+    chunks = _batch_chunks(items)
+    if len(chunks) == 1:
+        ok = [_post_batch(items, results, timeout)]
+    else:
+        pool = _sentiment_executor()
+        futures = [
+            pool.submit(contextvars.copy_context().run, _post_batch, chunk, results, timeout)
+            for chunk in chunks
+        ]
+        ok = [f.result() for f in futures]
+    return results if all(ok) else None
+
+def _post_batch(items, results, timeout):
+    """One /analyze/batch call, filling `results` in place. False on failure."""
+    url = _join(SENT_BASE, "analyze/batch")
+    try:
+        r = _call(
+            "sentiment", "POST", "/analyze/batch", url, coalesce=True, json={"items": items},
+            timeout=_timeout(SENTIMENT_DEADLINE if timeout is None else timeout),
+        )
+        return _batch_results(r, results) is not None
+    except Exception as e:
+        logger.warning("sentiment batch (%d texts) failed: %s", len(items), _describe(e))
+        return False
+
+def _batch_chunks(items):
+    n = SENTIMENT_BATCH_SIZE
+    return [items[i:i + n] for i in range(0, len(items), n)]
+
+def _batch_items(texts):
+    texts = [(t or "").strip() for t in texts]
+    results = [dict(FALLBACK) if t else dict(NEUTRAL) for t in texts]
+    return results, [{"id": i, "text": t} for i, t in enumerate(texts) if t]
+
+def _batch_results(r, results):
+    global SENTIMENT_BATCH
+    if r.status_code in (404, 405):
+        logger.warning("sentiment batch endpoint not available; disabling")
+        SENTIMENT_BATCH = False
+        return None
+    r.raise_for_status()
+    for res in codec.loads(r.content).get("results") or []:
+        i = res.get("id")
+        if isinstance(i, int) and 0 <= i < len(results):
+            results[i] = {"sentiment": res.get("sentiment") or "neutral"}
+    return results
+
+# ---------------------------------------------------------
+# Sentiment result cache
+# ---------------------------------------------------------
+# Review text never changes after insert, so a sentiment is cached forever
+# under a hash of the text. The "sentiment" cache alias (settings.CACHES)
+# decides where it lives and how it is bounded.
+
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+def _sentiment_cache():
+    from django.core.cache import caches
+    return caches["sentiment"]
+
+def _sentiment_key(text: str) -> str:
+    return "sent:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def sentiment_cache_stats() -> dict:
+    with _cache_lock:
+        return dict(_cache_stats)
+
+def _sentiment_lookup(texts):
+    """Split `texts` into cached labels and the de-duplicated misses."""
+    texts = [(t or "").strip() for t in texts]
+    labels = ["neutral"] * len(texts)
+    keys = {i: _sentiment_key(t) for i, t in enumerate(texts) if t}
+    if not keys:
+        return labels, keys, {}
+
+    try:
+        cached = _sentiment_cache().get_many(set(keys.values()))
+    except Exception as e:
+        logger.warning("sentiment cache read error: %s", e)
+        cached = {}
+
+    missing = {}  # key -> text, de-duplicated
+    for i, key in keys.items():
+        if key in cached:
+            labels[i] = cached[key]
+        else:
+            missing.setdefault(key, texts[i])
+    hits = sum(1 for k in keys.values() if k in cached)
+    with _cache_lock:
+        _cache_stats["hits"] += hits
+        _cache_stats["misses"] += len(keys) - hits
+    return labels, keys, missing
+
+def _score_local(texts):
+    """Score `texts` in-process; same result shape as the HTTP calls."""
+    from . import sentiment
+    t0 = time.perf_counter()
+    try:
+        labels = sentiment.label_many(texts, processes=SENTIMENT_PROCESSES)
+    except Exception:
+        _observe("sentiment-local", "CALL", "label_many", "error", t0)
+        logger.exception("local sentiment engine failed")
+        return [dict(FALLBACK) for _ in texts]
+    _observe("sentiment-local", "CALL", "label_many", "ok", t0)
+    return [{"sentiment": label} for label in labels]
+
+def _sentiment_store(labels, keys, miss_keys, results, fallback="neutral"):
+    """Fill in analyzer results and cache the ones that are real answers."""
+    scored, fresh = {}, {}
+    for key, res in zip(miss_keys, results):
+        res = res or FALLBACK
+        if res.get("fallback"):
+            scored[key] = fallback
+        else:
+            scored[key] = fresh[key] = res.get("sentiment") or "neutral"
+    for i, key in keys.items():
+        if key in scored:
+            labels[i] = scored[key]
+    if fresh:
+        try:
+            _sentiment_cache().set_many(fresh, timeout=None)
+        except Exception as e:
+            logger.warning("sentiment cache write error: %s", e)
+    return labels
+
+def get_review_sentiments(texts, fallback="neutral"):
+    """
+    Sentiment labels for `texts`, in order. Cached texts cost nothing;
+    the rest go to the analyzer in one batch (fan-out if that fails), or
+    to the in-process engine with SENTIMENT_ENGINE=local, and only real
+    analyzer answers are written back to the cache.
+    Texts the analyzer could not score get `fallback` (None lets callers
+    that persist the label tell them apart).
+    """
+    labels, keys, missing = _sentiment_lookup(texts)
+    if not missing:
+        return labels
+
+    miss_keys = list(missing)
+    miss_texts = [missing[k] for k in miss_keys]
+    if SENTIMENT_ENGINE == "local":
+        return _sentiment_store(
+            labels, keys, miss_keys, _score_local(miss_texts), fallback
+        )
+    results = analyze_review_sentiments_batch(miss_texts)
+    if results is None:
+        results = analyze_review_sentiments_many(miss_texts)
+    return _sentiment_store(labels, keys, miss_keys, results, fallback)
+
+def post_sentiments(items):
+    """
+    POST stored sentiments for existing reviews, [{"id": ..., "sentiment": ...}].
+    Used by the backfill command; returns the backend reply or None.
+    """
+    url = _join(BACKEND_URL, "updateSentiments")
     try:
-        r = requests.get(url, timeout=10)
+        r = _call("backend", "POST", "/updateSentiments", url,
+                  json={"items": items}, timeout=_timeout())
         r.raise_for_status()
-        return r.json()
+        return _body(r)
     except Exception as e:
-        print("[restapis] SENT error:", e)
-        return {"sentiment": "neutral"}
+        logger.warning("backend POST /updateSentiments (%d reviews) failed: %s",
+                       len(items), _describe(e))
+        return None
 
 def post_review(data: dict):
     """POST a review to the Node/Mongo backend."""
     url = _join(BACKEND_URL, "insert_review")
-    print(f"[restapis] POST {url}")
     try:
-        r = requests.post(url, json=data, timeout=10)
+        r = _call("backend", "POST", "/insert_review", url, json=data, timeout=_timeout())
         r.raise_for_status()
-        ct = (r.headers.get("content-type") or "").lower()
-        return r.json() if "application/json" in ct else r.text
+        return _body(r)
     except Exception as e:
-        print("[restapis] POST error:", e)
+        logger.warning("backend POST /insert_review failed: %s", _describe(e))
         return {"status": "error", "error": str(e)}
+
+# ---------------------------------------------------------
+# Async variants (ASGI views)
+# ---------------------------------------------------------
+# Same upstreams, timeouts and sentiment cache as above, over httpx so one
+# event loop can keep hundreds of upstream calls in flight. Clients are
+# bound to the running loop, so they are kept per loop.
+
+try:
+    import httpx
+except ImportError:  # optional unless the async views are enabled
+    httpx = None
+
+_async_clients = weakref.WeakKeyDictionary()
+
+def _async_client(upstream: str):
+    if httpx is None:
+        raise RuntimeError("httpx is required for the async views")
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(upstream)
+    if client is None:
+        size = BACKEND_POOL_SIZE if upstream == "backend" else SENTIMENT_POOL_SIZE
+        # An async worker multiplexes many requests over one pool.
+        limits = httpx.Limits(
+            max_connections=size * 10,
+            max_keepalive_connections=size if KEEPALIVE else 0,
+        )
+        client = clients[upstream] = httpx.AsyncClient(
+            limits=limits,
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            transport=httpx.AsyncHTTPTransport(retries=GET_RETRIES, limits=limits),
+        )
+    return client
+
+def _async_timeout(read: float = None):
+    connect, read = _timeout(read)
+    return httpx.Timeout(read, connect=connect)
+
+async def _acall_once(upstream, method, endpoint, url, **kwargs):
+    kwargs = _json_body(kwargs, "content")
+    t0 = time.perf_counter()
+    try:
+        r = await _async_client(upstream).request(method, url, **kwargs)
+    except Exception:
+        _observe(upstream, method, endpoint, "error", t0)
+        _settle(upstream, None)
+        raise
+    _observe(upstream, method, endpoint, r.status_code, t0, len(r.content))
+    _settle(upstream, r.status_code)
+    return r
+
+async def _acall(upstream: str, method: str, endpoint: str, url: str, coalesce=False, **kwargs):
+    """_call for the async client (single-flight within the event loop only)."""
+    if not (coalesce and SINGLE_FLIGHT):
+        return await _acall_once(upstream, method, endpoint, url, **kwargs)
+    return await singleflight.ado(
+        _flight_key(upstream, method, url, kwargs),
+        lambda: _acall_once(upstream, method, endpoint, url, **kwargs),
+    )
+
+async def _aget(endpoint, params, decode):
+    url = _join(BACKEND_URL, endpoint)
+    if params:
+        url = f"{url}?{urlencode(params)}"
+    try:
+        for attempt in range(GET_RETRIES + 1):
+            r = await _acall("backend", "GET", endpoint, url, coalesce=True)
+            if r.status_code not in (502, 503, 504) or attempt == GET_RETRIES:
+                break
+            await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+        r.raise_for_status()
+        return decode(r)
+    except Exception as e:
+        logger.warning("backend GET %s failed: %s",
+                       metrics.endpoint_template(endpoint), _describe(e))
+        return None
+
+async def async_get_request(endpoint: str, **params):
+    """Async GET the Node/Mongo backend (retries 502/503/504 like the sync one)."""
+    return await _aget(endpoint, params, _body)
+
+async def async_get_request_raw(endpoint: str, **params):
+    """get_request_raw for the async views."""
+    return await _aget(endpoint, params, _raw_body)
+
+async def async_post_review(data: dict):
+    """Async POST a review to the Node/Mongo backend."""
+    url = _join(BACKEND_URL, "insert_review")
+    try:
+        r = await _acall("backend", "POST", "/insert_review", url, json=data)
+        r.raise_for_status()
+        return _body(r)
+    except Exception as e:
+        logger.warning("backend POST /insert_review failed: %s", _describe(e))
+        return {"status": "error", "error": str(e)}
+
+async def async_analyze_review_sentiments(text: str, timeout: float = None):
+    if not _sentiment_breaker.allow():
+        return dict(FALLBACK)
+    url = _join(SENT_BASE, _analyze_path(text))
+    try:
+        r = await _acall("sentiment", "GET", "/analyze/:text", url, coalesce=True,
+                         timeout=_async_timeout(timeout))
+        r.raise_for_status()
+        return codec.loads(r.content)
+    except Exception as e:
+        logger.warning("sentiment GET failed: %s", _describe(e))
+        return dict(FALLBACK)
+
+async def async_analyze_review_sentiments_many(texts, deadline: float = None):
+    texts = [(t or "").strip() for t in texts]
+    deadline = SENTIMENT_DEADLINE if deadline is None else deadline
+    results = [dict(FALLBACK) if t else dict(NEUTRAL) for t in texts]
+    todo = [i for i, t in enumerate(texts) if t]
+    if not todo:
+        return results
+
+    sem = asyncio.Semaphore(SENTIMENT_WORKERS)
+
+    async def one(i):
+        async with sem:
+            results[i] = await async_analyze_review_sentiments(texts[i], deadline)
+
+    tasks = [asyncio.ensure_future(one(i)) for i in todo]
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for t in pending:
+        t.cancel()
+    if pending:
+        logger.warning("sentiment deadline hit: %d/%d neutral", len(pending), len(todo))
+    return results
+
+async def async_analyze_review_sentiments_batch(texts, timeout: float = None):
+    results, items = _batch_items(texts)
+    if not items:
+        return results
+    if not SENTIMENT_BATCH:
+        return None
+
+    if not _sentiment_breaker.allow():
+        return results
+
+    ok = await asyncio.gather(
+        *(_apost_batch(chunk, results, timeout) for chunk in _batch_chunks(items))
+    )
+    return results if all(ok) else None
+
+async def _apost_batch(items, results, timeout):
+    url = _join(SENT_BASE, "analyze/batch")
+    try:
+        r = await _acall(
+            "sentiment", "POST", "/analyze/batch", url, coalesce=True, json={"items": items},
+            timeout=_async_timeout(SENTIMENT_DEADLINE if timeout is None else timeout),
+        )
+        return _batch_results(r, results) is not None
+    except Exception as e:
+        logger.warning("sentiment batch (%d texts) failed: %s", len(items), _describe(e))
+        return False
+
+async def async_get_review_sentiments(texts, fallback="neutral"):
+    """Async get_review_sentiments; cache access runs off the event loop."""
+    labels, keys, missing = await sync_to_async(_sentiment_lookup)(texts)
+    if not missing:
+        return labels
+
+    miss_keys = list(missing)
+    miss_texts = [missing[k] for k in miss_keys]
+    if SENTIMENT_ENGINE == "local":
+        # CPU-bound: run it on a worker thread, not the event loop.
+        results = await sync_to_async(_score_local, thread_sensitive=False)(miss_texts)
+    else:
+        results = await async_analyze_review_sentiments_batch(miss_texts)
+        if results is None:
+            results = await async_analyze_review_sentiments_many(miss_texts)
+    return await sync_to_async(_sentiment_store)(
+        labels, keys, miss_keys, results, fallback
+    )
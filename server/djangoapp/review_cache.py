@@ -0,0 +1,104 @@
+# server/djangoapp/review_cache.py
+"""
+Per-dealer cache of sentiment-enriched reviews.
+
+get_dealer_reviews fills it; add_review writes the newly inserted review
+straight into it instead of re-fetching the dealer's reviews, and drops
+the entry when an insert fails or the entry cannot be updated safely.
+Lives in the "dealers" cache alias so all workers see the same lists.
+
+Appends are serialised per dealer with an exclusive flock on
+<REVIEW_LOCK_DIR>/reviews-<id>.lock, which holds across threads and
+worker processes alike. The cache's own add() cannot serve as the lock:
+FileBasedCache implements it as has_key() then set(), so two workers
+could both take it.
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; appends then drop the entry instead
+    fcntl = None
+
+LOCK_DIR = os.environ.get(
+    "REVIEW_LOCK_DIR",
+    os.path.join(tempfile.gettempdir(), "dealership_cache", "locks"),
+)
+LOCK_WAIT = 0.2
+
+
+def _cache():
+    return caches["dealers"]
+
+
+def _key(dealer_id) -> str:
+    return f"reviews:{int(dealer_id)}"
+
+
+def get_reviews(dealer_id):
+    """Cached enriched reviews for `dealer_id`, or None."""
+    if settings.REVIEW_CACHE_TTL <= 0:
+        return None
+    return _cache().get(_key(dealer_id))
+
+
+def set_reviews(dealer_id, reviews):
+    if settings.REVIEW_CACHE_TTL > 0:
+        _cache().set(_key(dealer_id), list(reviews), timeout=settings.REVIEW_CACHE_TTL)
+
+
+def invalidate_reviews(dealer_id):
+    _cache().delete(_key(dealer_id))
+
+
+@contextmanager
+def _locked(dealer_id):
+    """Yields True holding the dealer's append lock, False if it was not had in time."""
+    if fcntl is None:
+        yield False
+        return
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    with open(os.path.join(LOCK_DIR, f"reviews-{int(dealer_id)}.lock"), "a+b") as fp:
+        deadline = time.monotonic() + LOCK_WAIT
+        while True:
+            try:
+                fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    yield False
+                    return
+                time.sleep(0.005)
+        try:
+            yield True
+        finally:
+            fcntl.flock(fp, fcntl.LOCK_UN)
+
+
+def append_review(dealer_id, review):
+    """
+    Write-through for a review the backend just accepted. Returns the
+    updated list, or None if nothing was cached for the dealer (or the
+    lock could not be had, in which case the entry is dropped rather
+    than risk losing either write).
+    """
+    if settings.REVIEW_CACHE_TTL <= 0:
+        return None
+    with _locked(dealer_id) as locked:
+        if not locked:
+            invalidate_reviews(dealer_id)
+            return None
+        reviews = _cache().get(_key(dealer_id))
+        if reviews is None:
+            return None
+        reviews = [r for r in reviews if r.get("id") is None or r.get("id") != review.get("id")]
+        reviews.append(review)
+        set_reviews(dealer_id, reviews)
+        return reviews
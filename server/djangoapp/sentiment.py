@@ -0,0 +1,205 @@
+# server/djangoapp/sentiment.py
+"""
+In-process sentiment engine: the analyzer microservice's VADER labels
+without the HTTP hop.
+
+The lexicon is read once per process from the same vader_lexicon.zip the
+microservice ships (SENTIMENT_LEXICON overrides the path) into a plain
+word -> valence dict. Labels are the microservice's: the largest of
+pos/neu/neg wins, ties going to positive.
+
+label_many() scores a list in one pass: duplicates are scored once,
+texts with no lexicon word skip VADER entirely (they can only be
+neutral), and VADER's per-text punctuation table is replaced by a few
+set lookups per token. With `processes` > 1 the distinct texts are split
+across a process pool for CPU parallelism.
+
+Used by restapis when SENTIMENT_ENGINE=local. Needs nltk.
+"""
+
+import os
+import re
+import string
+import sys
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+LEXICON_PATH = os.environ.get(
+    "SENTIMENT_LEXICON",
+    str(Path(__file__).parent / "microservices" / "sentiment" / "vader_lexicon.zip"),
+)
+_LEXICON_MEMBER = "vader_lexicon/vader_lexicon.txt"
+
+# Lists shorter than this are not worth shipping to another process.
+MIN_CHUNK = 64
+
+_PUNCT = string.punctuation
+_STRIP_PUNCT = re.compile(f"[{re.escape(_PUNCT)}]")
+
+_engine = None
+_engine_lock = threading.Lock()
+_pool = None  # (pid, processes, ProcessPoolExecutor)
+_pool_lock = threading.Lock()
+
+
+def load_lexicon(path: str = None) -> dict:
+    """word -> valence from a VADER lexicon .txt or the nltk_data .zip."""
+    path = path or LEXICON_PATH
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            raw = zf.read(_LEXICON_MEMBER).decode("utf-8")
+    else:
+        with open(path, encoding="utf-8") as fp:
+            raw = fp.read()
+    lexicon = {}
+    for line in raw.splitlines():
+        parts = line.strip().split("\t")
+        if len(parts) >= 2:
+            lexicon[sys.intern(parts[0])] = float(parts[1])
+    return lexicon
+
+
+def _tokens(text: str, punc: frozenset) -> list:
+    """
+    VADER's SentiText tokens. SentiText builds a dict of every
+    (punctuation, word) pair per text to strip one leading/trailing
+    punctuation mark; since words hold no punctuation, the same token is
+    found by splitting off the punctuation run and checking both halves.
+    """
+    words = {w for w in _STRIP_PUNCT.sub("", text).split() if len(w) > 1}
+    tokens = []
+    for we in text.split():
+        if len(we) <= 1:
+            continue
+        if we not in words:
+            head = len(we) - len(we.lstrip(_PUNCT))
+            tail = len(we) - len(we.rstrip(_PUNCT))
+            if head and we[:head] in punc and we[head:] in words:
+                we = we[head:]
+            elif tail and we[-tail:] in punc and we[:-tail] in words:
+                we = we[:-tail]
+        tokens.append(we)
+    return tokens
+
+
+def _label(scores: dict) -> str:
+    pos, neg, neu = scores["pos"], scores["neg"], scores["neu"]
+    if neg > pos and neg > neu:
+        return "negative"
+    if neu > neg and neu > pos:
+        return "neutral"
+    return "positive"
+
+
+def _analyzer_class():
+    from nltk.sentiment.vader import SentiText, SentimentIntensityAnalyzer, VaderConstants
+
+    class _Text(SentiText):
+        def _words_and_emoticons(self):
+            return _tokens(self.text, self._punc)
+
+    class Engine(SentimentIntensityAnalyzer):
+        """SentimentIntensityAnalyzer over a preloaded lexicon dict."""
+
+        def __init__(self, lexicon: dict):
+            self.lexicon = lexicon
+            self.constants = VaderConstants()
+            _Text._punc = frozenset(self.constants.PUNC_LIST)
+
+        def polarity_scores(self, text):
+            # nltk's loop, with _Text in place of SentiText.
+            sentitext = _Text(
+                text, self.constants.PUNC_LIST, self.constants.REGEX_REMOVE_PUNCTUATION
+            )
+            sentiments = []
+            words = sentitext.words_and_emoticons
+            first_index = {}
+            for idx, token in enumerate(words):
+                first_index.setdefault(token, idx)
+            for item in words:
+                i = first_index[item]
+                if (
+                    i < len(words) - 1
+                    and item.lower() == "kind"
+                    and words[i + 1].lower() == "of"
+                ) or item.lower() in self.constants.BOOSTER_DICT:
+                    sentiments.append(0)
+                    continue
+                sentiments = self.sentiment_valence(0, sentitext, item, i, sentiments)
+            sentiments = self._but_check(words, sentiments)
+            return self.score_valence(sentiments, text)
+
+        def label(self, text: str) -> str:
+            text = text if isinstance(text, str) else str(text)
+            tokens = _tokens(text, _Text._punc)
+            # Only lexicon words carry valence; boosters, negations and
+            # idioms just scale it, so without one every token scores 0.
+            if tokens and not any(t.lower() in self.lexicon for t in tokens):
+                return "neutral"
+            return _label(self.polarity_scores(text))
+
+    return Engine
+
+
+def engine():
+    """This process's engine; the lexicon is loaded on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _analyzer_class()(load_lexicon())
+    return _engine
+
+
+def label(text: str) -> str:
+    text = (text or "").strip()
+    return engine().label(text) if text else "neutral"
+
+
+def _label_chunk(texts):
+    eng = engine()
+    return [eng.label(t) for t in texts]
+
+
+def _process_pool(processes: int) -> ProcessPoolExecutor:
+    # One pool per process (gunicorn forks workers after import), sized on
+    # first use; concurrent first requests must not each start one. The
+    # lexicon is loaded before the pool forks so children inherit it
+    # instead of each reading the zip.
+    global _pool
+    key = (os.getpid(), processes)
+    pool = _pool
+    if pool is None or pool[:2] != key:
+        with _pool_lock:
+            pool = _pool
+            if pool is None or pool[:2] != key:
+                engine()
+                if pool is not None and pool[0] == key[0]:
+                    pool[2].shutdown(wait=False)
+                pool = _pool = (*key, ProcessPoolExecutor(max_workers=processes, initializer=engine))
+    return pool[2]
+
+
+def label_many(texts, processes: int = 1) -> list:
+    """
+    Labels for `texts`, in order. Blank texts are neutral. `processes` > 1
+    spreads the distinct texts over a process pool once there are enough
+    of them to pay for the pickling.
+    """
+    texts = [(t or "").strip() for t in texts]
+    unique = list(dict.fromkeys(t for t in texts if t))
+    if not unique:
+        return ["neutral"] * len(texts)
+
+    if processes > 1 and len(unique) >= 2 * MIN_CHUNK:
+        n = min(processes, len(unique) // MIN_CHUNK)
+        size = -(-len(unique) // n)
+        chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+        scored = [lab for part in _process_pool(processes).map(_label_chunk, chunks) for lab in part]
+    else:
+        scored = _label_chunk(unique)
+
+    by_text = dict(zip(unique, scored))
+    return [by_text[t] if t else "neutral" for t in texts]
@@ -0,0 +1,30 @@
+# server/djangoapp/signals.py
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import bump_catalog_version
+from .models import CarMake, CarModel
+
+
+@receiver(post_save, sender=CarMake, dispatch_uid="catalog_make_saved")
+@receiver(post_delete, sender=CarMake, dispatch_uid="catalog_make_deleted")
+@receiver(post_save, sender=CarModel, dispatch_uid="catalog_model_saved")
+@receiver(post_delete, sender=CarModel, dispatch_uid="catalog_model_deleted")
+def invalidate_catalog(sender, **kwargs):
+    """Any change to makes/models retires every cached catalog query."""
+    bump_catalog_version()
+
+
+@receiver(connection_created, dispatch_uid="sqlite_pragmas")
+def sqlite_pragmas(sender, connection, **kwargs):
+    """
+    WAL lets readers run alongside the single writer instead of blocking
+    on it; synchronous=NORMAL is durable enough in WAL mode and skips an
+    fsync per commit. The busy timeout is set in djangoproj/database.py.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
@@ -0,0 +1,206 @@
+# server/djangoapp/singleflight.py
+"""
+Single-flight: concurrent identical upstream calls share one call.
+
+restapis routes idempotent calls (backend GETs, analyzer GETs and batch
+POSTs) through do() / ado(). The first caller for a key makes the call;
+callers arriving while it is in flight wait for it and get the same
+response object. Each caller decodes the body itself, so nobody shares
+parsed JSON. An exception is re-raised to every waiter.
+
+shared() also coalesces calls across the worker processes on a host
+(restapis' sync path, with SINGLE_FLIGHT_SHARED=1). An exclusive flock on <SINGLE_FLIGHT_DIR>/<hash>.lock picks
+one leader. It writes the response to <hash>.res, and workers that
+waited on the lock read that file instead of calling. A result is only
+reused by callers that started waiting before it was written, so this
+never serves a stale response; it is not a cache.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import weakref
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; cross-worker mode is then a no-op
+    fcntl = None
+
+DIR = os.environ.get(
+    "SINGLE_FLIGHT_DIR",
+    os.path.join(tempfile.gettempdir(), "dealership_cache", "flights"),
+)
+# Stale .lock/.res files are swept now and then by whoever writes one.
+SWEEP_AGE = 60.0
+SWEEP_CHANCE = 0.01
+
+_stats_lock = threading.Lock()
+_stats = {"calls": 0, "shared": 0, "shared_across_workers": 0}
+
+
+def _count(name, n=1):
+    with _stats_lock:
+        _stats[name] += n
+
+
+def stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def do(key, fn):
+    """fn() once for all concurrent callers with the same `key`."""
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        _count("shared")
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    _count("calls")
+    try:
+        flight.result = fn()
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+# Tasks are bound to their event loop, so each loop keeps its own table.
+_async_flights = weakref.WeakKeyDictionary()
+
+
+async def ado(key, fn):
+    """
+    do() for coroutines: `fn` is a coroutine function. The call runs as
+    its own task and every caller, the one that started it included,
+    awaits it through shield(), so a cancelled caller (e.g. a client
+    that disconnected) leaves it running for the rest.
+    """
+    flights = _async_flights.setdefault(asyncio.get_running_loop(), {})
+    task = flights.get(key)
+    if task is not None:
+        _count("shared")
+    else:
+        _count("calls")
+        task = flights[key] = asyncio.ensure_future(fn())
+
+        def done(t):
+            if flights.get(key) is t:
+                del flights[key]
+            if not t.cancelled():
+                t.exception()  # mark retrieved when every caller went away
+
+        task.add_done_callback(done)
+    return await asyncio.shield(task)
+
+
+# ---------------------------------------------------------
+# Across worker processes (file locks)
+# ---------------------------------------------------------
+
+def _paths(key):
+    name = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+    return os.path.join(DIR, name + ".lock"), os.path.join(DIR, name + ".res")
+
+
+def _read(path, since):
+    try:
+        with open(path, "rb") as fp:
+            header = json.loads(fp.readline())
+            if header.get("at", 0) < since:
+                return None
+            return header, fp.read()
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, header, body):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fp:
+        fp.write(json.dumps(dict(header, at=time.time())).encode("utf-8") + b"\n")
+        fp.write(body)
+    os.replace(tmp, path)
+
+
+def _sweep():
+    now = time.time()
+    try:
+        for entry in os.scandir(DIR):
+            if now - entry.stat().st_mtime > SWEEP_AGE:
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+def shared(key, fn, encode, decode, timeout: float):
+    """
+    fn() once per key across processes. `encode(result)` gives the
+    (header dict, body bytes) handed to the other workers; `decode`
+    turns them back into a result. Waits at most `timeout` for another
+    worker's call, then makes its own.
+    """
+    if fcntl is None:
+        return fn()
+    since = time.time()
+    os.makedirs(DIR, exist_ok=True)
+    lock_path, res_path = _paths(key)
+    with open(lock_path, "a+b") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # Another worker has this call in flight; wait for its result.
+            deadline = time.monotonic() + timeout
+            while True:
+                time.sleep(0.005)
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        return fn()
+            found = _read(res_path, since)
+            if found is not None:
+                _count("shared_across_workers")
+                return decode(*found)
+        try:
+            result = fn()
+            try:
+                _write(res_path, *encode(result))
+                if random.random() < SWEEP_CHANCE:
+                    _sweep()
+            except OSError:
+                pass  # the others just make their own call
+            return result
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
@@ -6,6 +6,24 @@ from . import views
 
 app_name = 'djangoapp'
 
+# Under ASGI (uvicorn) the upstream-bound views run as coroutines.
+if getattr(settings, "ASYNC_VIEWS", False):
+    dealers_view    = views.get_dealerships_async
+    details_view    = views.get_dealer_details_async
+    near_view       = views.dealers_near_async
+    reviews_view    = views.get_dealer_reviews_async
+    page_view       = views.get_dealer_page_async
+    export_view     = views.export_reviews_async
+    add_review_view = views.add_review_async
+else:
+    dealers_view    = views.get_dealerships
+    details_view    = views.get_dealer_details
+    near_view       = views.dealers_near
+    reviews_view    = views.get_dealer_reviews
+    page_view       = views.get_dealer_page
+    export_view     = views.export_reviews
+    add_review_view = views.add_review
+
 urlpatterns = [
     path('login/',  views.login_user,  name='login'),
     path('logout/', views.logout_user, name='logout'),
@@ -14,12 +32,17 @@ urlpatterns = [
     path('get_cars/', views.get_cars, name='get_cars'),
 
     # dealers
-    path('get_dealers/', views.get_dealerships, name='get_dealers'),
-    path('get_dealers/<str:state>/', views.get_dealerships, name='get_dealers_by_state'),
-    path('dealerships/', views.get_dealerships, name='dealerships'),  # Alternative endpoint
-    path('get_dealerships/', views.get_dealerships, name='get_dealerships'),  # Alternative endpoint
-    path('dealer/<int:dealer_id>/', views.get_dealer_details, name='dealer_details'),
-    path('reviews/dealer/<int:dealer_id>/', views.get_dealer_reviews, name='dealer_reviews'),
+    path('get_dealers/', dealers_view, name='get_dealers'),
+    path('get_dealers/<str:state>/', dealers_view, name='get_dealers_by_state'),
+    path('dealerships/', dealers_view, name='dealerships'),  # Alternative endpoint
+    path('get_dealerships/', dealers_view, name='get_dealerships'),  # Alternative endpoint
+    path('dealers/near/', near_view, name='dealers_near'),
+    path('dealer/<int:dealer_id>/', details_view, name='dealer_details'),
+    path('reviews/dealer/<int:dealer_id>/', reviews_view, name='dealer_reviews'),
+    path('dealer/<int:dealer_id>/page/', page_view, name='dealer_page'),
+
+    path('add_review/', add_review_view, name='add_review'),
+    path('reviews/export/', export_view, name='export_reviews'),
 
-    path('add_review/', views.add_review, name='add_review'),
+    path('metrics/', views.metrics_view, name='metrics'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,18 +1,55 @@
 # server/djangoapp/views.py
 
-import json
+import asyncio
+import contextvars
+import hmac
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate, login, logout
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.http import JsonResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.timezone import now
 
-from .models import CarMake, CarModel
-from .populate import initiate
-from .restapis import get_request, analyze_review_sentiments, post_review
+from . import codec, dealer_replica, export, geo, metrics, singleflight
+from .catalog import get_cars as query_cars, parse_filters as parse_car_filters
+from .dealer_cache import (
+    acached_payload,
+    acached_response,
+    cached_payload,
+    cached_response,
+    detail_key,
+    envelope,
+    list_key,
+    respond,
+)
+from .paging import backend_params, page_key, paginate, parse_page, project
+from .codec import JsonResponse
+from .restapis import (
+    get_request,
+    get_request_raw,
+    get_review_sentiments,
+    post_review,
+    sentiment_breaker_stats,
+    sentiment_cache_stats,
+    single_flight_stats,
+    async_get_request,
+    async_get_request_raw,
+    async_get_review_sentiments,
+    async_post_review,
+)
+from .review_cache import (
+    append_review as append_cached_review,
+    get_reviews as get_cached_reviews,
+    invalidate_reviews as invalidate_cached_reviews,
+    set_reviews as set_cached_reviews,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,8 +67,8 @@ def login_user(request):
         return JsonResponse({"detail": "Method not allowed"}, status=405)
 
     try:
-        payload = json.loads(request.body or "{}")
-    except json.JSONDecodeError:
+        payload = codec.loads(request.body or b"{}")
+    except ValueError:
         return JsonResponse({"detail": "Invalid JSON"}, status=400)
 
     username = payload.get("userName") or payload.get("username") or ""
@@ -63,7 +100,7 @@ def register_user(request):
         return JsonResponse({"detail": "Method not allowed"}, status=405)
 
     try:
-        data = json.loads(request.body.decode("utf-8"))
+        data = codec.loads(request.body)
     except Exception:
         return JsonResponse({"detail": "Invalid JSON"}, status=400)
 
@@ -94,66 +131,375 @@ def register_user(request):
 # Dealerships / Reviews
 # ---------------------------------------------------------
 
+def _dealers_state(request, state):
+    return request.GET.get("state") or state
+
+
+def _dealers_endpoint(state):
+    return "/fetchDealers" if state in (None, "", "All") else f"/fetchDealers/{state}"
+
+
+# Always fetched from the backend, whatever ?fields= asks for: the cursor
+# needs the id and the sentiment fallback needs the text.
+REVIEW_KEYS = ("id", "review", "sentiment")
+
+
+def _unscored(reviews):
+    """Reviews stored before sentiment was computed at ingest time."""
+    return [r for r in reviews if not r.get("sentiment")]
+
+
+def _fill_sentiment(reviews, labels):
+    """
+    Set each review's label; a missing one (the analyzer's fallback=None)
+    reads as neutral. Returns False if any was missing, so the list is not
+    cached with a fallback label in it.
+    """
+    scored = True
+    for r, label in zip(reviews, labels):
+        r["sentiment"] = label or "neutral"
+        scored = scored and label is not None
+    return scored
+
+
+def _bad_page(error):
+    return JsonResponse({"status": 400, "message": str(error)}, status=400)
+
+
+def _replica():
+    """The dealer replica index (possibly stale), or None when not in use."""
+    return dealer_replica.current() if settings.DEALER_REPLICA else None
+
+
+async def _areplica():
+    return await dealer_replica.acurrent() if settings.DEALER_REPLICA else None
+
+
+def _fresh(index):
+    return index if index is not None and index.fresh() else None
+
+
+def _in_zip(dealerships, zip_code):
+    if not zip_code or not isinstance(dealerships, list):
+        return dealerships
+    return [d for d in dealerships if str(d.get("zip")) == zip_code]
+
+
+def _list_query(page, zip_code):
+    query = page_key(page)
+    if zip_code:
+        query = f"{query}&zip={zip_code}" if query else f"zip={zip_code}"
+    return query
+
+
+def _replica_dealers(request, index, state, zip_code, page):
+    if zip_code or page:
+        return JsonResponse(_dealers_payload(index.dealers_for(state, zip_code), page, ordered=True))
+    return respond(request, index.list_entry(state))
+
+
+def _replica_details(request, index, dealer_id):
+    entry = index.detail_entry(dealer_id) if index is not None else None
+    return respond(request, entry) if entry is not None else None
+
+
+def _dealers_payload(dealerships, page, ordered=False):
+    if dealerships is None:
+        return None
+    if not page:
+        return {"status": 200, "dealers": dealerships}
+    items, next_cursor = paginate(dealerships, page, ordered)
+    return {"status": 200, "dealers": project(items, page["fields"]),
+            "next_cursor": next_cursor}
+
+
 def get_dealerships(request, state="All"):
-    """List all dealers, or filter by ?state=XX."""
-    qs_state = request.GET.get("state")
-    if qs_state:
-        state = qs_state
+    """
+    List all dealers, or filter by ?state=XX and/or ?zip=. Optional
+    ?limit=&cursor= paging and ?fields= projection. Served from the
+    dealer replica while it is fresh, else from the backend (cached per
+    state and page), else from a stale replica.
+    """
+    state = _dealers_state(request, state)
+    zip_code = (request.GET.get("zip") or "").strip()
+    try:
+        page = parse_page(request)
+    except ValueError as e:
+        return _bad_page(e)
+
+    index = _replica()
+    if _fresh(index):
+        return _replica_dealers(request, index, state, zip_code, page)
+
+    def build():
+        if zip_code:
+            dealerships = _in_zip(get_request(_dealers_endpoint(state)), zip_code)
+            return _dealers_payload(dealerships, page)
+        if settings.DEALER_PASSTHROUGH and not page:
+            body = get_request_raw(_dealers_endpoint(state))
+            return None if body is None else envelope("dealers", body)
+        dealerships = get_request(_dealers_endpoint(state), **backend_params(page))
+        return _dealers_payload(dealerships, page)
+
+    response = cached_response(request, list_key(state, _list_query(page, zip_code)), build)
+    if response is None and index is not None:
+        # Backend down: stale dealers beat none.
+        return _replica_dealers(request, index, state, zip_code, page)
+    return response or JsonResponse({"status": 200, "dealers": None})
+
+
+def _dealer_reviews(dealer_id):
+    """Enriched reviews from the review cache, else fetched, scored and cached."""
+    cached = get_cached_reviews(dealer_id)
+    if cached is not None:
+        return cached
+
+    reviews = get_request(f"/fetchReviews/dealer/{dealer_id}")
+    if not isinstance(reviews, list):
+        return []
+    legacy = _unscored(reviews)
+    labels = []
+    if legacy:
+        labels = get_review_sentiments([r.get("review") for r in legacy], fallback=None)
+    if _fill_sentiment(legacy, labels):
+        set_cached_reviews(dealer_id, reviews)
+    return reviews
+
+
+def _dealer_reviews_page(dealer_id, page):
+    """
+    One page of enriched reviews. Cut from the cached list when there is
+    one; otherwise only the page is fetched and scored (and not cached).
+    """
+    cached = get_cached_reviews(dealer_id)
+    if cached is not None:
+        return paginate(cached, page)
 
-    endpoint = "/fetchDealers" if state in (None, "", "All") else f"/fetchDealers/{state}"
-    dealerships = get_request(endpoint)
-    return JsonResponse({"status": 200, "dealers": dealerships})
+    reviews = get_request(f"/fetchReviews/dealer/{dealer_id}",
+                          **backend_params(page, REVIEW_KEYS))
+    if not isinstance(reviews, list):
+        return [], None
+    items, next_cursor = paginate(reviews, page)
+    legacy = _unscored(items)
+    if legacy:
+        _fill_sentiment(legacy, get_review_sentiments([r.get("review") for r in legacy]))
+    return items, next_cursor
 
 
 def get_dealer_reviews(request, dealer_id):
-    """Return dealer reviews, enriched with sentiment analysis."""
+    """
+    Return dealer reviews, enriched with sentiment analysis. Optional
+    ?limit=&cursor= paging and ?fields= projection.
+    """
     if not dealer_id:
         return JsonResponse({"status": 400, "message": "Bad Request"})
+    try:
+        page = parse_page(request)
+    except ValueError as e:
+        return _bad_page(e)
+
+    if not page:
+        return JsonResponse({"status": 200, "reviews": _dealer_reviews(dealer_id)})
+    items, next_cursor = _dealer_reviews_page(dealer_id, page)
+    return JsonResponse({"status": 200, "reviews": project(items, page["fields"]),
+                         "next_cursor": next_cursor})
 
-    reviews = get_request(f"/fetchReviews/dealer/{dealer_id}") or []
-    enriched = []
-    if isinstance(reviews, list):
-        for r in reviews:
-            txt = (r.get("review") or "").strip()
-            try:
-                result = analyze_review_sentiments(txt) if txt else {}
-            except Exception:
-                result = {}
-            r["sentiment"] = (result or {}).get("sentiment", "neutral")
-            enriched.append(r)
 
-    return JsonResponse({"status": 200, "reviews": enriched})
+def _dealer_details(dealer_id):
+    dealership = get_request(f"/fetchDealer/{dealer_id}")
+    return None if dealership is None else {"status": 200, "dealer": dealership}
 
 
 def get_dealer_details(request, dealer_id):
-    """Return details for one dealer."""
+    """
+    Return details for one dealer: from the fresh replica, else the
+    backend (cached per dealer id), else a stale replica.
+    """
     if not dealer_id:
         return JsonResponse({"status": 400, "message": "Bad Request"})
-    dealership = get_request(f"/fetchDealer/{dealer_id}")
-    return JsonResponse({"status": 200, "dealer": dealership})
 
+    index = _replica()
+    response = _replica_details(request, _fresh(index), dealer_id)
+    if response is not None:
+        return response
 
-@csrf_exempt
-def add_review(request):
+    def build():
+        if settings.DEALER_PASSTHROUGH:
+            body = get_request_raw(f"/fetchDealer/{dealer_id}")
+            return None if body is None else envelope("dealer", body)
+        return _dealer_details(dealer_id)
+
+    response = cached_response(request, detail_key(dealer_id), build)
+    response = response or _replica_details(request, index, dealer_id)
+    return response or JsonResponse({"status": 200, "dealer": None})
+
+# ---------------------------------------------------------
+# Nearest dealers
+# ---------------------------------------------------------
+# A k-nearest search in a KD-tree (geo.py): the replica's, built once per
+# sync. Without a fresh replica, one over the backend's dealer list,
+# rebuilt at most every DEALER_CACHE_TTL seconds; if the backend is down,
+# a stale replica or list. A build takes about a second per 100k dealers,
+# so concurrent requests share one (single-flight) and the async view
+# runs it off the event loop.
+
+_backend_near = {"tree": None, "expires": 0.0}
+_NEAR_FLIGHT = ("dealers-near-tree",)
+
+
+def _backend_near_tree(dealerships):
+    """A tree over a freshly fetched dealer list, or None if the fetch failed."""
+    if not isinstance(dealerships, list):
+        return None
+    tree = geo.KDTree(dealerships)
+    _backend_near.update(tree=tree, expires=time.monotonic() + settings.DEALER_CACHE_TTL)
+    return tree
+
+
+def _backend_near_cached():
+    if time.monotonic() < _backend_near["expires"]:
+        return _backend_near["tree"]
+    return None
+
+
+def _refresh_near_tree():
+    return _backend_near_tree(get_request("/fetchDealers"))
+
+
+def _decoded_near_tree(body):
+    try:
+        dealerships = None if body is None else codec.loads(body)
+    except ValueError:
+        dealerships = None
+    return _backend_near_tree(dealerships)
+
+
+async def _arefresh_near_tree():
+    # Raw bytes: decoding the whole list is off the loop too, with the build.
+    body = await async_get_request_raw("/fetchDealers")
+    return await sync_to_async(_decoded_near_tree, thread_sensitive=False)(body)
+
+
+def _near_response(tree, query):
+    if tree is None:
+        return JsonResponse({"status": 200, "dealers": None})
+    return JsonResponse(geo.payload(tree, query))
+
+
+def dealers_near(request):
     """
-    Accepts POST JSON from frontend.
-    Builds payload for Node/Mongo backend, posts it, then
-    returns updated reviews so UI refreshes immediately.
+    The ?k= (default 10, at most 100) dealers nearest ?lat=&lon=,
+    optionally only those within ?radius= km, nearest first, each with
+    its distance_km.
     """
-    if request.method != "POST":
-        return JsonResponse(
-            {"status": 405, "message": "Method not allowed"}, status=405
+    try:
+        query = geo.parse_query(request.GET)
+    except ValueError as e:
+        return _bad_page(e)
+
+    index = _replica()
+    if _fresh(index):
+        return _near_response(index.tree(), query)
+    tree = _backend_near_cached()
+    if tree is None:
+        tree = singleflight.do(_NEAR_FLIGHT, _refresh_near_tree)
+    if tree is None:
+        tree = index.tree() if index is not None else _backend_near["tree"]
+    return _near_response(tree, query)
+
+# ---------------------------------------------------------
+# Dealer page (details + reviews [+ cars] in one response)
+# ---------------------------------------------------------
+# The dealer and review screens used to make two or three requests in a
+# row. This view makes the upstream fetches side by side instead.
+
+DEALER_PAGE_WORKERS = max(1, int(os.environ.get("DEALER_PAGE_WORKERS", "16")))
+
+_page_executor = None
+
+
+def _dealer_page_executor() -> ThreadPoolExecutor:
+    # Created lazily so each gunicorn worker gets its own pool after fork.
+    global _page_executor
+    if _page_executor is None:
+        _page_executor = ThreadPoolExecutor(
+            max_workers=DEALER_PAGE_WORKERS, thread_name_prefix="dealer-page"
         )
+    return _page_executor
 
-    if not request.user.is_authenticated:
-        return JsonResponse({"status": 403, "message": "Unauthorized"}, status=403)
 
-    try:
-        body = (request.body or b"").decode("utf-8")
-        data = json.loads(body) if body else {}
-    except Exception:
-        return JsonResponse({"status": 400, "message": "Invalid JSON"}, status=400)
+def _page_details(dealer_id, index):
+    if index is not None and dealer_id in index.by_id:
+        return {"status": 200, "dealer": index.by_id[dealer_id]}
+    return cached_payload(detail_key(dealer_id), lambda: _dealer_details(dealer_id))
+
+
+async def _apage_details(dealer_id, index):
+    if index is not None and dealer_id in index.by_id:
+        return {"status": 200, "dealer": index.by_id[dealer_id]}
+    return await acached_payload(detail_key(dealer_id), lambda: _adealer_details(dealer_id))
+
 
+def _dealer_page_query(request):
+    """
+    (page, car filters or None, whether to include reviews); raises
+    ValueError on bad params. Without ?include= the page has reviews only.
+    """
+    page = parse_page(request)
+    include = {p.strip() for p in request.GET.get("include", "reviews").split(",")}
+    filters = parse_car_filters(request.GET) if "cars" in include else None
+    return page, filters, "reviews" in include
+
+
+def _dealer_page_payload(details, reviews, page, cars):
+    payload = {"status": 200, "dealer": details["dealer"] if details else None}
+    if reviews is not None and page:
+        items, next_cursor = reviews
+        payload["reviews"] = project(items, page["fields"])
+        payload["next_cursor"] = next_cursor
+    elif reviews is not None:
+        payload["reviews"] = reviews
+    if cars is not None:
+        payload["cars"] = cars
+    return payload
+
+
+def get_dealer_page(request, dealer_id):
+    """
+    Dealer details and reviews with sentiment in one response. ?include=
+    picks the sections next to the dealer: "reviews" (the default) and
+    "cars", the car catalog filtered as in get_cars; ?include=cars alone
+    skips the review fetch and its scoring. Reviews take the same
+    ?limit=&cursor=&fields= paging as get_dealer_reviews.
+    """
+    if not dealer_id:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+    try:
+        page, filters, with_reviews = _dealer_page_query(request)
+    except ValueError as e:
+        return _bad_page(e)
+
+    pool = _dealer_page_executor()
+    # Context copies keep the request profile; each call gets its own.
+    details = pool.submit(
+        contextvars.copy_context().run, _page_details, dealer_id, _fresh(_replica()),
+    )
+    reviews = None
+    if with_reviews and page:
+        reviews = pool.submit(contextvars.copy_context().run,
+                              _dealer_reviews_page, dealer_id, page)
+    elif with_reviews:
+        reviews = pool.submit(contextvars.copy_context().run, _dealer_reviews, dealer_id)
+    # The catalog is a local (cached) query; run it on this thread, which
+    # owns the request's DB connection, while the upstream calls are out.
+    cars = query_cars(filters) if filters is not None else None
+    return JsonResponse(_dealer_page_payload(
+        details.result(), reviews.result() if reviews else None, page, cars
+    ))
+
+
+def _parse_review(request, data):
+    """Validate the posted review; returns (doc, None) or (None, error response)."""
     dealer_id   = (data.get("dealership") or data.get("dealerId")
                    or data.get("dealer_id") or data.get("id"))
     review_txt  = data.get("review") or ""
@@ -166,7 +512,7 @@ def add_review(request):
     car_year      = data.get("car_year") or ""
 
     if not dealer_id or not str(review_txt).strip():
-        return JsonResponse(
+        return None, JsonResponse(
             {"status": 400, "message": "dealer_id and review are required"},
             status=400,
         )
@@ -182,14 +528,21 @@ def add_review(request):
         "car_year":      str(car_year),
         "time":          now().strftime("%Y-%m-%dT%H:%M:%SZ"),
     }
+    return doc, None
+
 
+def _read_review_body(request):
+    """Parse the request body; returns (data, None) or (None, error response)."""
     try:
-        backend_resp = post_review(doc)
-    except Exception as e:
-        return JsonResponse(
-            {"status": 502, "message": f"backend error: {e}"}, status=502
+        body = request.body or b""
+        return (codec.loads(body) if body else {}), None
+    except Exception:
+        return None, JsonResponse(
+            {"status": 400, "message": "Invalid JSON"}, status=400
         )
 
+
+def _backend_ok(backend_resp):
     ok = False
     if isinstance(backend_resp, dict):
         if backend_resp.get("ok") or backend_resp.get("acknowledged"):
@@ -198,39 +551,402 @@ def add_review(request):
             ok = True
         if backend_resp.get("_id") or backend_resp.get("insertedId") or backend_resp.get("id"):
             ok = True
-        if not ok and backend_resp:
+        if not ok and backend_resp and backend_resp.get("status") != "error":
             ok = True
+    return ok
+
+
+def _inserted_review(doc, backend_resp):
+    """The stored document as the backend echoed it, falling back to ours."""
+    if isinstance(backend_resp, dict) and backend_resp.get("id") is not None:
+        return {**doc, **backend_resp}
+    return dict(doc)
+
 
-    if not ok:
+@csrf_exempt
+def add_review(request):
+    """
+    Accepts POST JSON from frontend.
+    Builds payload for Node/Mongo backend, posts it, then
+    returns updated reviews so UI refreshes immediately. The new review is
+    written into the dealer's review cache, so a warm dealer costs a single
+    backend call.
+    """
+    if request.method != "POST":
+        return JsonResponse(
+            {"status": 405, "message": "Method not allowed"}, status=405
+        )
+
+    if not request.user.is_authenticated:
+        return JsonResponse({"status": 403, "message": "Unauthorized"}, status=403)
+
+    data, error = _read_review_body(request)
+    if error:
+        return error
+    doc, error = _parse_review(request, data)
+    if error:
+        return error
+
+    # Score once at ingest and store it with the review; reads then only
+    # call the analyzer for legacy reviews. Left unset if the analyzer is down.
+    sentiment = get_review_sentiments([doc["review"]], fallback=None)[0]
+    if sentiment:
+        doc["sentiment"] = sentiment
+
+    dealer_id = doc["dealership"]
+    try:
+        backend_resp = post_review(doc)
+    except Exception as e:
+        invalidate_cached_reviews(dealer_id)
+        return JsonResponse(
+            {"status": 502, "message": f"backend error: {e}"}, status=502
+        )
+
+    if not _backend_ok(backend_resp):
+        # The insert may or may not have landed; don't trust the cached list.
+        invalidate_cached_reviews(dealer_id)
         return JsonResponse(
             {"status": 502, "message": "backend_failed", "body": backend_resp},
             status=502,
         )
 
+    if sentiment is None:
+        # Unscored (analyzer down): re-read rather than cache a fallback label.
+        invalidate_cached_reviews(dealer_id)
+        updated = None
+    else:
+        updated = append_cached_review(dealer_id, _inserted_review(doc, backend_resp))
+    if updated is None:
+        updated = _dealer_reviews(dealer_id)
+
+    return JsonResponse(
+        {"status": 200, "reviews": updated, "backend": backend_resp}, status=200
+    )
+
+# ---------------------------------------------------------
+# Async (ASGI) variants of the dealer/review views
+# ---------------------------------------------------------
+# Wired in by djangoapp/urls.py when settings.ASYNC_VIEWS is on (run under
+# uvicorn). Same payloads as the sync views; upstream calls go through the
+# httpx client in restapis instead of blocking a worker thread.
+
+async def get_dealerships_async(request, state="All"):
+    state = _dealers_state(request, state)
+    zip_code = (request.GET.get("zip") or "").strip()
+    try:
+        page = parse_page(request)
+    except ValueError as e:
+        return _bad_page(e)
+
+    index = await _areplica()
+    if _fresh(index):
+        return _replica_dealers(request, index, state, zip_code, page)
+
+    async def build():
+        if zip_code:
+            dealerships = _in_zip(await async_get_request(_dealers_endpoint(state)), zip_code)
+            return _dealers_payload(dealerships, page)
+        if settings.DEALER_PASSTHROUGH and not page:
+            body = await async_get_request_raw(_dealers_endpoint(state))
+            return None if body is None else envelope("dealers", body)
+        dealerships = await async_get_request(
+            _dealers_endpoint(state), **backend_params(page)
+        )
+        return _dealers_payload(dealerships, page)
+
+    response = await acached_response(request, list_key(state, _list_query(page, zip_code)), build)
+    if response is None and index is not None:
+        return _replica_dealers(request, index, state, zip_code, page)
+    return response or JsonResponse({"status": 200, "dealers": None})
+
+
+async def _adealer_reviews(dealer_id):
+    cached = await sync_to_async(get_cached_reviews)(dealer_id)
+    if cached is not None:
+        return cached
+
+    reviews = await async_get_request(f"/fetchReviews/dealer/{dealer_id}")
+    if not isinstance(reviews, list):
+        return []
+    legacy = _unscored(reviews)
+    labels = []
+    if legacy:
+        labels = await async_get_review_sentiments(
+            [r.get("review") for r in legacy], fallback=None
+        )
+    if _fill_sentiment(legacy, labels):
+        await sync_to_async(set_cached_reviews)(dealer_id, reviews)
+    return reviews
+
+
+async def _adealer_reviews_page(dealer_id, page):
+    cached = await sync_to_async(get_cached_reviews)(dealer_id)
+    if cached is not None:
+        return paginate(cached, page)
+
+    reviews = await async_get_request(f"/fetchReviews/dealer/{dealer_id}",
+                                      **backend_params(page, REVIEW_KEYS))
+    if not isinstance(reviews, list):
+        return [], None
+    items, next_cursor = paginate(reviews, page)
+    legacy = _unscored(items)
+    if legacy:
+        labels = await async_get_review_sentiments([r.get("review") for r in legacy])
+        _fill_sentiment(legacy, labels)
+    return items, next_cursor
+
+
+async def get_dealer_reviews_async(request, dealer_id):
+    if not dealer_id:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
     try:
-        updated = get_request(f"/fetchReviews/dealer/{int(dealer_id)}") or []
-    except Exception:
-        updated = []
+        page = parse_page(request)
+    except ValueError as e:
+        return _bad_page(e)
+
+    if not page:
+        return JsonResponse({"status": 200, "reviews": await _adealer_reviews(dealer_id)})
+    items, next_cursor = await _adealer_reviews_page(dealer_id, page)
+    return JsonResponse({"status": 200, "reviews": project(items, page["fields"]),
+                         "next_cursor": next_cursor})
+
+
+async def _adealer_details(dealer_id):
+    dealership = await async_get_request(f"/fetchDealer/{dealer_id}")
+    return None if dealership is None else {"status": 200, "dealer": dealership}
+
+
+async def get_dealer_details_async(request, dealer_id):
+    if not dealer_id:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+
+    index = await _areplica()
+    response = _replica_details(request, _fresh(index), dealer_id)
+    if response is not None:
+        return response
+
+    async def build():
+        if settings.DEALER_PASSTHROUGH:
+            body = await async_get_request_raw(f"/fetchDealer/{dealer_id}")
+            return None if body is None else envelope("dealer", body)
+        return await _adealer_details(dealer_id)
+
+    response = await acached_response(request, detail_key(dealer_id), build)
+    response = response or _replica_details(request, index, dealer_id)
+    return response or JsonResponse({"status": 200, "dealer": None})
 
+
+async def dealers_near_async(request):
+    try:
+        query = geo.parse_query(request.GET)
+    except ValueError as e:
+        return _bad_page(e)
+
+    index = await _areplica()
+    if _fresh(index):
+        return _near_response(await index.atree(), query)
+    tree = _backend_near_cached()
+    if tree is None:
+        tree = await singleflight.ado(_NEAR_FLIGHT, _arefresh_near_tree)
+    if tree is None:
+        tree = await index.atree() if index is not None else _backend_near["tree"]
+    return _near_response(tree, query)
+
+
+async def get_dealer_page_async(request, dealer_id):
+    if not dealer_id:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+    try:
+        page, filters, with_reviews = _dealer_page_query(request)
+    except ValueError as e:
+        return _bad_page(e)
+
+    async def no_reviews():
+        return None
+
+    if not with_reviews:
+        reviews = no_reviews()
+    elif page:
+        reviews = _adealer_reviews_page(dealer_id, page)
+    else:
+        reviews = _adealer_reviews(dealer_id)
+    fetches = [_apage_details(dealer_id, _fresh(await _areplica())), reviews]
+    if filters is not None:
+        fetches.append(sync_to_async(query_cars)(filters))
+    details, reviews, *cars = await asyncio.gather(*fetches)
+    return JsonResponse(
+        _dealer_page_payload(details, reviews, page, cars[0] if cars else None)
+    )
+
+
+async def add_review_async(request):
+    if request.method != "POST":
+        return JsonResponse(
+            {"status": 405, "message": "Method not allowed"}, status=405
+        )
+
+    # request.user is loaded lazily from the session DB; do that off-loop.
+    if not await sync_to_async(lambda: request.user.is_authenticated)():
+        return JsonResponse({"status": 403, "message": "Unauthorized"}, status=403)
+
+    data, error = _read_review_body(request)
+    if error:
+        return error
+    doc, error = _parse_review(request, data)
+    if error:
+        return error
+
+    sentiment = (await async_get_review_sentiments([doc["review"]], fallback=None))[0]
+    if sentiment:
+        doc["sentiment"] = sentiment
+
+    dealer_id = doc["dealership"]
+    backend_resp = await async_post_review(doc)
+    if not _backend_ok(backend_resp):
+        await sync_to_async(invalidate_cached_reviews)(dealer_id)
+        return JsonResponse(
+            {"status": 502, "message": "backend_failed", "body": backend_resp},
+            status=502,
+        )
+
+    if sentiment is None:
+        await sync_to_async(invalidate_cached_reviews)(dealer_id)
+        updated = None
+    else:
+        updated = await sync_to_async(append_cached_review)(
+            dealer_id, _inserted_review(doc, backend_resp)
+        )
+    if updated is None:
+        updated = await _adealer_reviews(dealer_id)
     return JsonResponse(
         {"status": 200, "reviews": updated, "backend": backend_resp}, status=200
     )
 
+# csrf_exempt only wraps async views from Django 5.0 on; the attribute is
+# what CsrfViewMiddleware actually checks.
+add_review_async.csrf_exempt = True
+
 # ---------------------------------------------------------
 # Cars (Django ORM seeded models)
 # ---------------------------------------------------------
 
 def get_cars(request):
-    """Return list of cars from Django DB. Populate DB on first call if empty."""
+    """
+    Return list of cars from Django DB, optionally filtered by ?make=,
+    ?type=, ?year= / ?year_min= / ?year_max= and ?dealer_id=. The catalog
+    is seeded at deploy time by `manage.py seed_cars` (see entrypoint.sh),
+    not here.
+    """
     if request.method != "GET":
         return JsonResponse({"detail": "Method not allowed"}, status=405)
 
-    if not CarModel.objects.exists():
-        try:
-            initiate()
-        except Exception as e:
-            return JsonResponse({"detail": f"Init failed: {e}"}, status=500)
+    try:
+        filters = parse_car_filters(request.GET)
+    except ValueError as e:
+        return JsonResponse({"detail": str(e)}, status=400)
+    return JsonResponse({"cars": query_cars(filters)})
 
-    car_models = CarModel.objects.select_related("car_make").all()
-    cars = [{"CarModel": cm.name, "CarMake": cm.car_make.name} for cm in car_models]
-    return JsonResponse({"cars": cars})
+# ---------------------------------------------------------
+# Review export (NDJSON / CSV stream)
+# ---------------------------------------------------------
+
+def _export_format(request):
+    """(format, None) or (None, error response)."""
+    if request.method != "GET":
+        return None, JsonResponse({"detail": "Method not allowed"}, status=405)
+    token = settings.EXPORT_TOKEN
+    if not token:
+        return None, JsonResponse({"detail": "Export is disabled"}, status=403)
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return None, JsonResponse({"detail": "Unauthorized"}, status=401)
+    fmt = (request.GET.get("format") or "ndjson").lower()
+    if fmt not in export.FORMATS:
+        return None, JsonResponse(
+            {"detail": f"format must be one of {', '.join(export.FORMATS)}"}, status=400
+        )
+    return fmt, None
+
+
+def _export_response(fmt, chunks):
+    content_type, ext = export.FORMATS[fmt]
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="reviews.{ext}"'
+    response["Cache-Control"] = "no-store"
+    response["X-Accel-Buffering"] = "no"  # let nginx pass chunks straight on
+    return response
+
+
+def _logged(chunks):
+    # The status line is long gone; re-raising makes the server drop the
+    # connection, so the client sees a truncated transfer, not a short file.
+    try:
+        yield from chunks
+    except export.ExportError as e:
+        logger.warning("review export aborted: %s", e)
+        raise
+
+
+async def _alogged(chunks):
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except export.ExportError as e:
+        logger.warning("review export aborted: %s", e)
+        raise
+
+
+def export_reviews(request):
+    """
+    Every review with its sentiment, streamed as NDJSON (default) or
+    ?format=csv. See djangoapp/export.py.
+    """
+    fmt, error = _export_format(request)
+    if error:
+        return error
+    return _export_response(fmt, _logged(export.stream(fmt)))
+
+
+async def export_reviews_async(request):
+    fmt, error = _export_format(request)
+    if error:
+        return error
+    return _export_response(fmt, _alogged(export.astream(fmt)))
+
+# ---------------------------------------------------------
+# Metrics (Prometheus text format)
+# ---------------------------------------------------------
+
+_BREAKER_STATES = ("closed", "half-open", "open")
+
+
+def _metric_gauges():
+    breaker = sentiment_breaker_stats()
+    cache = sentiment_cache_stats()
+    flights = single_flight_stats()
+    return [
+        ("sentiment_breaker_state", "1 for the sentiment circuit breaker's current state.",
+         "gauge", [({"state": s}, int(breaker["state"] == s)) for s in _BREAKER_STATES]),
+        ("sentiment_breaker_trips_total", "Times the sentiment breaker opened.",
+         "counter", [({}, breaker["trips"])]),
+        ("sentiment_breaker_short_circuits_total",
+         "Sentiment calls answered with the fallback while the breaker was open.",
+         "counter", [({}, breaker["short_circuits"])]),
+        ("sentiment_cache_lookups_total", "Sentiment cache lookups by result.",
+         "counter", [({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])]),
+        ("upstream_single_flight_total",
+         "Coalescable upstream calls: made, or shared with an identical in-flight call.",
+         "counter", [({"outcome": "called"}, flights["calls"]),
+                     ({"outcome": "shared"}, flights["shared"]),
+                     ({"outcome": "shared_across_workers"}, flights["shared_across_workers"])]),
+    ]
+
+
+def metrics_view(request):
+    """Upstream latency histograms and sentiment breaker/cache figures for this worker."""
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed"}, status=405)
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return JsonResponse({"detail": "Unauthorized"}, status=401)
+    body = metrics.render(_metric_gauges(), pid=os.getpid())
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -3,8 +3,11 @@ Django settings for djangoproj project.
 """
 
 import os
+import tempfile
 from pathlib import Path
 
+from djangoproj import database
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # -------------------------------------------------------------------
@@ -50,6 +53,8 @@ INSTALLED_APPS = [
 # Middleware  (ensure CsrfViewMiddleware is present for admin/login)
 # -------------------------------------------------------------------
 MIDDLEWARE = [
+    # First, so "total" in Server-Timing covers the other middleware too.
+    "djangoapp.profiling.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -85,17 +90,150 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "djangoproj.wsgi.application"
+ASGI_APPLICATION = "djangoproj.asgi.application"
+
+# Serve the dealer/review views as coroutines. Only worth it under an ASGI
+# server, e.g.
+#   DJANGO_ASYNC_VIEWS=1 uvicorn djangoproj.asgi:application --workers 3
+ASYNC_VIEWS = os.environ.get("DJANGO_ASYNC_VIEWS", "0").lower() in ("1", "true", "yes")
 
 # -------------------------------------------------------------------
-# Database (lab uses SQLite for Django-side models)
+# Database
 # -------------------------------------------------------------------
+# DATABASE_URL picks the database (see djangoproj/database.py), e.g.
+#   DATABASE_URL=postgres://user:pass@db:5432/dealership?sslmode=require
+# Unset keeps the lab/dev SQLite file in BASE_DIR (WAL mode, busy timeout).
+#   DB_CONN_MAX_AGE      seconds a connection is reused (0 = per request)
+#   DB_POOL=1            psycopg pool per worker (PostgreSQL, Django 5.1+)
+#   DB_POOL_SIZE         its max size; at least the worker's thread count
+#   SQLITE_BUSY_TIMEOUT  seconds to wait on a locked SQLite database
 DATABASES = {
+    "default": database.config(
+        os.environ.get("DATABASE_URL", "sqlite:///db.sqlite3"),
+        BASE_DIR,
+        conn_max_age=int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        health_checks=os.environ.get("DB_HEALTH_CHECKS", "1").lower() in ("1", "true", "yes"),
+        pool=os.environ.get("DB_POOL", "0").lower() in ("1", "true", "yes"),
+        pool_size=int(os.environ.get("DB_POOL_SIZE", "10")),
+        busy_timeout=float(os.environ.get("SQLITE_BUSY_TIMEOUT", "20")),
+    )
+}
+
+# -------------------------------------------------------------------
+# Caches
+# -------------------------------------------------------------------
+# "sentiment" holds analyzer results keyed by a hash of the review text.
+# Defaults to an in-process LRU (LocMemCache); point it at a file or Redis
+# cache to share results between workers, e.g.
+#   SENTIMENT_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+#   SENTIMENT_CACHE_LOCATION=redis://127.0.0.1:6379/1
+# (for Redis, bound it with maxmemory + maxmemory-policy allkeys-lru).
+SENTIMENT_CACHE_BACKEND = os.environ.get(
+    "SENTIMENT_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+)
+
+
+# File and local-memory caches keep at most MAX_ENTRIES keys and, once
+# full, drop a tenth of them (the oldest for locmem, a random tenth for
+# files) on the next write. Django's default of 300 is far too small for
+# any alias here. Redis takes no such options; bound it with maxmemory.
+def _cull_options(backend, env, default):
+    if "redis" in backend.lower():
+        return {}
+    return {"MAX_ENTRIES": int(os.environ.get(env, str(default))), "CULL_FREQUENCY": 10}
+
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "default",
+    },
+    "sentiment": {
+        "BACKEND": SENTIMENT_CACHE_BACKEND,
+        "LOCATION": os.environ.get("SENTIMENT_CACHE_LOCATION", "sentiment"),
+        "TIMEOUT": None,
+        "KEY_PREFIX": "dealership",
+        "OPTIONS": _cull_options(SENTIMENT_CACHE_BACKEND, "SENTIMENT_CACHE_MAX_ENTRIES", 50000),
+    },
+}
+# "dealers" holds rendered dealer list/detail responses (see
+# djangoapp/dealer_cache.py) and enriched reviews per dealer. File-based by
+# default so all gunicorn workers on a pod share entries and see the same
+# invalidations. Size DEALER_CACHE_MAX_ENTRIES above states x pages plus
+# dealers x 2 (details and reviews); a cull that takes the generation key
+# empties the whole alias.
+DEALER_CACHE_TTL = int(os.environ.get("DEALER_CACHE_TTL", "300"))
+DEALER_CACHE_BACKEND = os.environ.get(
+    "DEALER_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+)
+CACHES["dealers"] = {
+    "BACKEND": DEALER_CACHE_BACKEND,
+    "LOCATION": os.environ.get(
+        "DEALER_CACHE_LOCATION",
+        os.path.join(tempfile.gettempdir(), "dealership_cache", "dealers"),
+    ),
+    "TIMEOUT": DEALER_CACHE_TTL,
+    "OPTIONS": _cull_options(DEALER_CACHE_BACKEND, "DEALER_CACHE_MAX_ENTRIES", 20000),
+}
+# Unpaged dealer lists and dealer details need no reshaping, so the
+# backend's JSON bytes are wrapped in the response envelope as they are
+# instead of being decoded and re-encoded. DEALER_PASSTHROUGH=0 turns it off.
+DEALER_PASSTHROUGH = os.environ.get("DEALER_PASSTHROUGH", "1").lower() in ("1", "true", "yes")
+# Dealer reads are served from a local replica of the backend's dealers
+# (djangoapp/dealer_replica.py, filled by `manage.py sync_dealers`) while
+# its last sync is under DEALER_REPLICA_MAX_AGE seconds old; an older
+# replica is only used when the backend fails. DEALER_REPLICA=0 turns it off.
+# entrypoint.sh re-syncs every DEALER_SYNC_EVERY seconds (default 60) in
+# the background; with DEALER_SYNC_EVERY=0, schedule `sync_dealers` well
+# inside DEALER_REPLICA_MAX_AGE some other way (sidecar, CronJob).
+DEALER_REPLICA = os.environ.get("DEALER_REPLICA", "1").lower() in ("1", "true", "yes")
+DEALER_REPLICA_MAX_AGE = int(os.environ.get("DEALER_REPLICA_MAX_AGE", "900"))
+# "catalog" holds get_cars query results under a version bumped on every
+# CarMake/CarModel change (djangoapp/catalog.py, djangoapp/signals.py).
+# Shared between workers for the same reason as "dealers".
+CATALOG_CACHE_TTL = int(os.environ.get("CATALOG_CACHE_TTL", "3600"))
+CATALOG_CACHE_BACKEND = os.environ.get(
+    "CATALOG_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+)
+CACHES["catalog"] = {
+    "BACKEND": CATALOG_CACHE_BACKEND,
+    "LOCATION": os.environ.get(
+        "CATALOG_CACHE_LOCATION",
+        os.path.join(tempfile.gettempdir(), "dealership_cache", "catalog"),
+    ),
+    "TIMEOUT": CATALOG_CACHE_TTL,
+    "OPTIONS": _cull_options(CATALOG_CACHE_BACKEND, "CATALOG_CACHE_MAX_ENTRIES", 5000),
 }
 
+# "sessions" backs the cached session engines below. The default file
+# cache is shared by the workers of one host only: with several hosts
+# (pods), a logout on one leaves the session cached, and still valid, on
+# the others. So "cached_db" is only the default when this alias is a
+# Redis or Memcached server every host talks to; a file cache on a
+# volume all hosts mount works too, with SESSION_ENGINE set explicitly.
+# A culled session is re-read from the database under "cached_db" but is
+# a logout under "cache", so there SESSION_CACHE_MAX_ENTRIES must exceed
+# the live sessions (or use Redis).
+SESSION_CACHE_BACKEND = os.environ.get(
+    "SESSION_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+)
+SESSION_CACHE_SHARED = any(
+    name in SESSION_CACHE_BACKEND.lower() for name in ("redis", "memcached")
+)
+CACHES["sessions"] = {
+    "BACKEND": SESSION_CACHE_BACKEND,
+    "LOCATION": os.environ.get(
+        "SESSION_CACHE_LOCATION",
+        os.path.join(tempfile.gettempdir(), "dealership_cache", "sessions"),
+    ),
+    "TIMEOUT": None,  # sessions set their own expiry
+    "OPTIONS": _cull_options(SESSION_CACHE_BACKEND, "SESSION_CACHE_MAX_ENTRIES", 100000),
+}
+
+# Sentiment-enriched reviews per dealer, kept in the same alias and updated
+# in place by add_review (djangoapp/review_cache.py).
+REVIEW_CACHE_TTL = int(os.environ.get("REVIEW_CACHE_TTL", "300"))
+
 # -------------------------------------------------------------------
 # Password validation
 # -------------------------------------------------------------------
@@ -134,6 +272,20 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # -------------------------------------------------------------------
 # Sessions / Cookies (work over HTTPS through the proxy)
 # -------------------------------------------------------------------
+# SESSION_ENGINE: "cached_db" reads sessions from the "sessions" cache and
+# writes through to django_session; "cache" never touches the database (a
+# cache flush logs everyone out); "db" reads every request's session from
+# django_session. The default is "cached_db" when the "sessions" cache is
+# shared across hosts (see SESSION_CACHE_SHARED above) and "db" otherwise,
+# since a per-host cache would keep serving sessions logged out elsewhere.
+# Expired rows are removed by `manage.py purge_sessions`.
+SESSION_ENGINE = os.environ.get(
+    "SESSION_ENGINE", "cached_db" if SESSION_CACHE_SHARED else "db"
+)
+if "." not in SESSION_ENGINE:
+    SESSION_ENGINE = f"django.contrib.sessions.backends.{SESSION_ENGINE}"
+SESSION_CACHE_ALIAS = "sessions"
+
 SESSION_COOKIE_SECURE = False  # Set to False for local development
 CSRF_COOKIE_SECURE = False     # Set to False for local development
 SESSION_COOKIE_SAMESITE = "Lax"
@@ -147,3 +299,44 @@ LOGIN_REDIRECT_URL = "/admin/"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [],  # frontend uses session cookie
 }
+
+# -------------------------------------------------------------------
+# Logging / metrics
+# -------------------------------------------------------------------
+# djangoapp logs to the console at DJANGOAPP_LOG_LEVEL. Per-upstream-call
+# lines from djangoapp.restapis are DEBUG, so the default INFO keeps them
+# out of the hot path; set DJANGOAPP_LOG_LEVEL=DEBUG to trace calls.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "plain": {"format": "%(asctime)s %(levelname)s %(name)s %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "plain"},
+    },
+    "loggers": {
+        "djangoapp": {
+            "handlers": ["console"],
+            "level": os.environ.get("DJANGOAPP_LOG_LEVEL", "INFO").upper(),
+            "propagate": False,
+        },
+    },
+}
+
+# Per-request profiling (djangoapp/profiling.py): a request is profiled
+# when it sends "<PROFILE_HEADER>: 1" or is sampled at PROFILE_SAMPLE_RATE
+# (0.0-1.0); only sampled ones are logged. PROFILE_HEADER= disables the
+# header trigger.
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER = os.environ.get("PROFILE_HEADER", "X-Profile")
+
+# /djangoapp/metrics (Prometheus text). If METRICS_TOKEN is set, scrapers
+# must send "Authorization: Bearer <token>".
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# /djangoapp/reviews/export (NDJSON/CSV of every review, scoring any
+# without a sentiment). Clients must send "Authorization: Bearer
+# <EXPORT_TOKEN>"; with no token set the endpoint is off (403).
+# `manage.py export_reviews` needs no token.
+EXPORT_TOKEN = os.environ.get("EXPORT_TOKEN", "")
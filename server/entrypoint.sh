@@ -23,6 +23,32 @@ python manage.py makemigrations --noinput || true
 python manage.py migrate --noinput || true
 python manage.py collectstatic --noinput || true
 
+# Seed the car catalog once (bulk insert; no-op if already seeded).
+# Set CAR_CATALOG_FILE to load a catalog file such as database/data/car_records.json.
+if [ -n "${CAR_CATALOG_FILE:-}" ]; then
+  python manage.py seed_cars --file "$CAR_CATALOG_FILE" || true
+else
+  python manage.py seed_cars || true
+fi
+
+# Fill the local dealer replica, then re-sync it in the background every
+# DEALER_SYNC_EVERY seconds (default 60): views stop trusting a replica
+# older than DEALER_REPLICA_MAX_AGE (900 s). DEALER_SYNC_EVERY=0 leaves
+# the schedule to a sidecar or CronJob running `manage.py sync_dealers`.
+python manage.py sync_dealers || true
+case "${DEALER_REPLICA:-1}" in
+  1|true|True|TRUE|yes|Yes|YES)
+    if [ "${DEALER_SYNC_EVERY:-60}" != "0" ]; then
+      ( sleep "${DEALER_SYNC_EVERY:-60}"
+        exec python manage.py sync_dealers --every "${DEALER_SYNC_EVERY:-60}" ) &
+    fi
+    ;;
+esac
+
+# Drop expired sessions left from earlier runs (batched; see
+# purge_sessions --every for a long-running sweeper).
+python manage.py purge_sessions || true
+
 # Create superuser if env provided
 python - <<'PY'
 import os, django
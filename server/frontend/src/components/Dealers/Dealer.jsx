@@ -15,32 +15,23 @@ export default function Dealer() {
   const [reviews, setReviews] = useState([]);
   const [unreviewed, setUnreviewed] = useState(false);
 
-  const dealer_url = `/djangoapp/dealer/${id}/`;
-  const reviews_url = `/djangoapp/reviews/dealer/${id}/`;
+  // dealer details + reviews in one request (fetched side by side server-side)
+  const page_url = `/djangoapp/dealer/${id}/page/`;
   const post_review = `/postreview/${id}`;
   const isLoggedIn = !!sessionStorage.getItem("username");
 
-  const get_dealer = async () => {
-    const res = await fetch(dealer_url);
+  const get_page = async () => {
+    const res = await fetch(page_url);
     const data = await res.json();
-    if (data.status === 200) {
-      setDealer(data.dealer || data);
-    } else {
-      console.error("dealer fetch failed", data);
+    if (data.status !== 200) {
+      console.error("dealer page fetch failed", data);
+      return;
     }
-  };
-
-  const get_reviews = async () => {
-    const res = await fetch(reviews_url);
-    const data = await res.json();
-    if (data.status === 200) {
-      if (Array.isArray(data.reviews) && data.reviews.length > 0) {
-        setReviews(data.reviews);
-      } else {
-        setUnreviewed(true);
-      }
+    setDealer(data.dealer || null);
+    if (Array.isArray(data.reviews) && data.reviews.length > 0) {
+      setReviews(data.reviews);
     } else {
-      console.error("reviews fetch failed", data);
+      setUnreviewed(true);
     }
   };
 
@@ -50,10 +41,7 @@ export default function Dealer() {
     neutral_icon;
 
   useEffect(() => {
-    (async () => {
-      try { await get_dealer(); } catch (e) { console.error(e); }
-      try { await get_reviews(); } catch (e) { console.error(e); }
-    })();
+    get_page().catch((e) => console.error(e));
   }, [id]);
 
   return (
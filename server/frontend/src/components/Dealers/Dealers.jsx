@@ -18,7 +18,8 @@ const Dealers = () => {
           ? `${dealersRoot}?state=${encodeURIComponent(state)}`
           : dealersRoot;
 
-      const res = await fetch(url, { method: "GET" });
+      // Revalidate with the server (ETag -> 304) instead of re-downloading.
+      const res = await fetch(url, { method: "GET", cache: "no-cache" });
       const ret = await res.json();
 
       // Normalize the payload (either {status, dealers: []} or just [])
@@ -19,9 +19,9 @@ export default function PostReview() {
   const [posting, setPosting] = useState(false);
 
   // API endpoints
-  const dealer_url    = `/djangoapp/dealer/${dealerId}/`;
-  const review_url    = `/djangoapp/add_review/`;
-  const carmodels_url = `/djangoapp/get_cars/`;
+  // dealer details + car catalog in one request (no reviews)
+  const page_url   = `/djangoapp/dealer/${dealerId}/page/?include=cars`;
+  const review_url = `/djangoapp/add_review/`;
 
   // ---- helpers ----
   const getNameFromSession = () => {
@@ -35,31 +35,20 @@ export default function PostReview() {
   };
 
   // ---- data loads ----
-  const get_dealer = async () => {
+  const get_page = async () => {
     try {
-      const res = await fetch(dealer_url);
+      const res = await fetch(page_url);
       const data = await res.json();
       const list = Array.isArray(data.dealer) ? data.dealer : data.dealer ? [data.dealer] : [];
       setDealer(list[0] || null);
+      setCarmodels(Array.isArray(data.cars) ? data.cars : []);
     } catch (e) {
-      console.error("dealer fetch error:", e);
-    }
-  };
-
-  const get_cars = async () => {
-    try {
-      const res = await fetch(carmodels_url, { method: "GET" });
-      const data = await res.json();
-      const list = Array.isArray(data.cars) ? data.cars : [];
-      setCarmodels(list);
-    } catch (e) {
-      console.error("car models fetch error:", e);
+      console.error("dealer page fetch error:", e);
     }
   };
 
   useEffect(() => {
-    get_dealer();
-    get_cars();
+    get_page();
   }, [dealerId]);
 
   // ---- submit ----